@@ -0,0 +1,37 @@
+from multiprocessing import Pipe, Process
+from sys import stdout
+
+from simple_rpc import Interface
+from simple_rpc.profiler import profile
+from simple_rpc.sim import Device, PtyServer
+
+
+calls = 20000
+
+
+def serve(connection: object) -> None:
+    device = Device()
+    device.add_method(lambda x: x, 'h: h', 'ping: Echo a value.')
+    device.add_method(
+        lambda: list(range(256)), '[h]:', 'vector: Get a vector.')
+
+    with PtyServer(device) as server:
+        connection.send(server.url)
+        connection.recv()
+
+
+connection, child_connection = Pipe()
+Process(target=serve, args=(child_connection, ), daemon=True).start()
+device = connection.recv()
+
+stdout.write('transport  method   calls/sec   p50 (us)   p99 (us)\n')
+for name, args in (('ping', (1, )), ('vector', ())):
+    for transport, url in (
+            ('pyserial', device), ('posix', 'posix://' + device)):
+        with Interface(url, wait=0) as interface:
+            result = profile(interface, name, args, calls)
+        stdout.write('{:10} {:8} {:9.0f} {:10.1f} {:10.1f}\n'.format(
+            transport, name, 1 / result.p50, result.p50 * 1e6,
+            result.p99 * 1e6))
+
+connection.send(None)
@@ -1,7 +1,8 @@
 from importlib.metadata import metadata
 
 from .extras import dict_to_object, object_to_dict
-from .simple_rpc import Interface, SerialInterface, SocketInterface
+from .simple_rpc import (
+    CallTimeoutError, Interface, SerialInterface, SocketInterface)
 
 
 _package_metadata = metadata('arduino_simple_rpc')
@@ -0,0 +1,97 @@
+from os import getenv, makedirs, replace, unlink
+from os.path import dirname, exists, expanduser, join
+from tempfile import NamedTemporaryFile
+
+from yaml import dump, safe_load
+
+
+baudrates = (
+    2000000, 1000000, 500000, 250000, 230400, 115200, 57600, 38400, 19200,
+    9600)
+cache_path = join(
+    getenv('XDG_CACHE_HOME', join(expanduser('~'), '.cache')), 'simple_rpc',
+    'baudrates.yml')
+
+
+def load_cache() -> dict:
+    """Load the baud rates that were found earlier.
+
+    :returns: Baud rates indexed by device name.
+    """
+    if not exists(cache_path):
+        return {}
+    with open(cache_path) as handle:
+        return safe_load(handle) or {}
+
+
+def save_cache(device: str, baudrate: int) -> None:
+    """Remember the baud rate of a device, the cache is replaced atomically
+    so that concurrent readers never see a partially written file.
+
+    :arg device: Device name.
+    :arg baudrate: Baud rate, 0 to forget the device.
+    """
+    rates = load_cache()
+    if baudrate:
+        rates[device] = baudrate
+    else:
+        rates.pop(device, None)
+
+    makedirs(dirname(cache_path), exist_ok=True)
+    with NamedTemporaryFile(
+            'w', dir=dirname(cache_path), delete=False) as handle:
+        try:
+            dump(rates, handle)
+        except BaseException:
+            handle.close()
+            unlink(handle.name)
+            raise
+    replace(handle.name, cache_path)
+
+
+def negotiate(
+        device: str, set_baudrate: callable, checksum: callable,
+        rates: tuple=baudrates, tries: int=2) -> int:
+    """Find the highest baud rate at which a device communicates reliably.
+
+    The cached baud rate of the device is tried first, then all candidates
+    in descending order. A baud rate is accepted when {tries} consecutive
+    method list requests give the same checksum and rejected after two
+    failed requests. Note that at a wrong baud rate, the device receives
+    garbage.
+
+    :arg device: Device name.
+    :arg set_baudrate: Function that changes the baud rate of the
+        connection.
+    :arg checksum: Function that requests the method list and returns a
+        checksum, it raises an IOError or ValueError on failure.
+    :arg rates: Candidate baud rates.
+    :arg tries: Number of consistent responses needed.
+
+    :returns: Baud rate.
+    """
+    cached = load_cache().get(device)
+    candidates = sorted(rates, reverse=True)
+    if cached:
+        candidates = [cached] + [rate for rate in candidates if rate != cached]
+
+    for baudrate in candidates:
+        set_baudrate(baudrate)
+
+        checksums = []
+        for _ in range(tries + 1):
+            try:
+                checksums.append(checksum())
+            except (IOError, ValueError):
+                checksums.append(None)
+            if checksums[-tries:] == [checksums[-1]] * tries and (
+                    checksums[-1] is not None):
+                if baudrate != cached:
+                    save_cache(device, baudrate)
+                return baudrate
+            if checksums.count(None) == 2:
+                break
+
+    if cached:
+        save_cache(device, 0)
+    raise IOError('no working baud rate found')
@@ -1,11 +1,19 @@
 from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser, FileType
 from json import dumps, loads
 from json.decoder import JSONDecodeError
+from os.path import isfile, join, splitext
+from re import sub
 from sys import stdout
 from typing import BinaryIO, TextIO
 
+from yaml import FullLoader, dump, load
+
 from . import doc_split, usage, version
-from .extras import json_utf8_decode, json_utf8_encode
+from .codegen import generate, generate_stub
+from .profiler import Profile, profile
+from .extras import json_decoder, json_encoder
+from .scan import scan
+from .scheduler import Sample, Scheduler
 from .simple_rpc import Interface
 
 
@@ -41,6 +49,43 @@ def _describe_method(method: dict) -> str:
     return description
 
 
+def _describe_profile(profile: Profile) -> str:
+    """Make a human readable description of call statistics.
+
+    :arg profile: Call statistics.
+
+    :returns: Call statistics in readable form.
+    """
+    return '\n'.join([
+        'calls: {}'.format(profile.count),
+        'latency (ms): p50 {:.3f}, p90 {:.3f}, p99 {:.3f}, max {:.3f}'.format(
+            *map(lambda x: x * 1000, (
+                profile.p50, profile.p90, profile.p99, profile.maximum))),
+        'size (bytes): request {}, response {}'.format(
+            profile.request_size, profile.response_size),
+        'throughput (bytes/s): {:.0f} of {:.0f} ({:.0%})'.format(
+            profile.bytes_per_second, profile.baudrate / 10,
+            profile.utilisation),
+        'time per call (ms): host {:.3f}, wire {:.3f}, other {:.3f}'.format(
+            *map(lambda x: x * 1000, (
+                profile.host_time, profile.transfer_time,
+                profile.device_time)))])
+
+
+def _describe_device(device: str, definition: dict) -> str:
+    """Make a human readable summary of an interface definition.
+
+    :arg device: Device name.
+    :arg definition: Interface definition.
+
+    :returns: Interface summary in readable form.
+    """
+    return '{}: {} {}, endianness {}, size_t {}, {} methods'.format(
+        device, definition['protocol'],
+        '.'.join(map(str, definition['version'])), definition['endianness'],
+        definition['size_t'], len(definition['methods']))
+
+
 def _loads(string: str) -> str:
     try:
         return loads(string)
@@ -48,9 +93,30 @@ def _loads(string: str) -> str:
         return string
 
 
+def _parse_args(method: dict, args: list) -> list:
+    """Convert command line parameters to the parameter types of a method.
+
+    Parameters are parsed as JSON, string parameters that are not valid JSON
+    strings are used as is.
+
+    :arg method: Method object.
+    :arg args: Method parameters.
+
+    :returns: Converted method parameters.
+    """
+    result = []
+    for parameter, arg in zip(method['parameters'], args):
+        obj = _loads(arg)
+        if parameter['fmt'] in ('c', 's') and not isinstance(obj, str):
+            obj = arg
+        result.append(json_encoder(parameter['fmt'])(obj))
+
+    return result
+
+
 def rpc_list(
-        handle: BinaryIO, device: str, baudrate: int, wait: int, save: TextIO
-        ) -> None:
+        handle: BinaryIO, device: str, baudrate: int, wait: int, save: TextIO,
+        reset: bool=True) -> None:
     """List the device methods.
 
     :arg handle: Output handle.
@@ -58,8 +124,9 @@ def rpc_list(
     :arg baudrate: Baud rate.
     :arg wait: Time in seconds before communication starts.
     :arg save: Interface definition file.
+    :arg reset: Allow the device to be reset when connecting.
     """
-    with Interface(device, baudrate, wait) as interface:
+    with Interface(device, baudrate, wait, reset=reset) as interface:
         if not save:
             for method in interface.device['methods'].values():
                 handle.write(_describe_method(method) + '\n\n\n')
@@ -69,7 +136,7 @@ def rpc_list(
 
 def rpc_call(
         handle: BinaryIO, device: str, baudrate: int, wait: int, load: TextIO,
-        name: str, args: list) -> None:
+        name: str, args: list, reset: bool=True) -> None:
     """Execute a method.
 
     :arg handle: Output handle.
@@ -79,14 +146,136 @@ def rpc_call(
     :arg load: Interface definition file.
     :arg name: Method name.
     :arg args: Method parameters.
+    :arg reset: Allow the device to be reset when connecting.
     """
-    args_ = list(map(lambda x: json_utf8_encode(_loads(x)), args))
-
-    with Interface(device, baudrate, wait, True, load) as interface:
-        result = interface.call_method(name, *args_)
+    with Interface(
+            device, baudrate, wait, True, load, reset=reset) as interface:
+        method = interface._method(name, args)
+        result = interface.call_method(name, *_parse_args(method, args))
 
         if result is not None:
-            handle.write('{}\n'.format(dumps(json_utf8_decode(result))))
+            handle.write('{}\n'.format(dumps(
+                json_decoder(method['return']['fmt'])(result))))
+
+
+def rpc_watch(
+        handle: BinaryIO, device: str, baudrate: int, wait: int, load: TextIO,
+        name: str, args: list, hz: float, count: int, reset: bool=True
+        ) -> None:
+    """Execute a method periodically.
+
+    Results are written as newline delimited JSON objects.
+
+    :arg handle: Output handle.
+    :arg device: Device.
+    :arg baudrate: Baud rate.
+    :arg wait: Time in seconds before communication starts.
+    :arg load: Interface definition file.
+    :arg name: Method name.
+    :arg args: Method parameters.
+    :arg hz: Number of calls per second.
+    :arg count: Number of calls (0 for no limit).
+    :arg reset: Allow the device to be reset when connecting.
+    """
+    if hz <= 0:
+        raise ValueError('frequency must be positive')
+
+    with Interface(
+            device, baudrate, wait, True, load, reset=reset) as interface:
+        method = interface._method(name, args)
+        decode = json_decoder(method['return']['fmt'])
+
+        def _write_sample(sample: Sample) -> None:
+            handle.write('{}\n'.format(dumps({
+                'time': sample.time,
+                'result': decode(sample.result),
+                'missed': sample.missed})))
+            handle.flush()
+
+        scheduler = Scheduler()
+        scheduler.add(interface, name, _parse_args(method, args), 1 / hz)
+        try:
+            scheduler.run(_write_sample, count)
+        except KeyboardInterrupt:
+            pass
+
+
+def rpc_profile(
+        handle: BinaryIO, device: str, baudrate: int, wait: int, load: TextIO,
+        name: str, args: list, count: int, reset: bool=True) -> None:
+    """Measure the latency of a method.
+
+    The time per call is split into time spent on the host (encoding and
+    decoding), the time needed to transfer the data at the configured baud
+    rate and the remaining time (device execution and driver latency).
+
+    :arg handle: Output handle.
+    :arg device: Device.
+    :arg baudrate: Baud rate.
+    :arg wait: Time in seconds before communication starts.
+    :arg load: Interface definition file.
+    :arg name: Method name.
+    :arg args: Method parameters.
+    :arg count: Number of calls.
+    :arg reset: Allow the device to be reset when connecting.
+    """
+    with Interface(
+            device, baudrate, wait, True, load, reset=reset) as interface:
+        method = interface._method(name, args)
+        handle.write('{}\n'.format(_describe_profile(
+            profile(interface, name, _parse_args(method, args), count))))
+
+
+def rpc_codegen(
+        source: str, baudrate: int, wait: int, output: str, name: str
+        ) -> None:
+    """Generate a client module and a type stub.
+
+    :arg source: Device or interface definition file.
+    :arg baudrate: Baud rate.
+    :arg wait: Time in seconds before communication starts.
+    :arg output: Name of the client module.
+    :arg name: Class name.
+    """
+    if isfile(source):
+        with open(source) as handle:
+            device = load(handle, Loader=FullLoader)
+    else:
+        with Interface(source, baudrate, wait) as interface:
+            device = dict(
+                interface.device, methods=dict(interface.device['methods']))
+
+    with open(output, 'w') as handle:
+        handle.write(generate(device, name))
+    with open(splitext(output)[0] + '.pyi', 'w') as handle:
+        handle.write(generate_stub(device, name))
+
+
+def rpc_scan(
+        handle: BinaryIO, devices: list, baudrate: int, wait: int,
+        timeout: float, save: str, reset: bool=True) -> None:
+    """Find simpleRPC devices.
+
+    All devices are queried at the same time. When no devices are given,
+    the serial ports /dev/ttyUSB*, /dev/ttyACM* and /dev/rfcomm* are
+    scanned.
+
+    :arg handle: Output handle.
+    :arg devices: Devices.
+    :arg baudrate: Baud rate.
+    :arg wait: Time in seconds before communication starts.
+    :arg timeout: Time in seconds to wait for a response.
+    :arg save: Directory for interface definition files.
+    :arg reset: Allow the devices to be reset when connecting.
+    """
+    definitions = scan(devices or None, baudrate, wait, timeout, reset)
+
+    for device, definition in definitions.items():
+        handle.write('{}\n'.format(_describe_device(device, definition)))
+        if save:
+            with open(join(save, '{}.yml'.format(
+                    sub(r'\W+', '_', device).strip('_'))), 'w') as output:
+                dump(definition, output, width=76, default_flow_style=False)
 
 
 def _arg_parser() -> object:
@@ -100,10 +289,14 @@ def _arg_parser() -> object:
     common_parser.add_argument(
         'device', metavar='DEVICE', type=str, help='device')
     common_parser.add_argument(
-        '-b', dest='baudrate', type=int, default=9600, help='baud rate')
+        '-b', dest='baudrate', type=int, default=9600,
+        help='baud rate (0 for automatic negotiation)')
     common_parser.add_argument(
         '-w', dest='wait', type=int, default=2,
         help='time before communication starts')
+    common_parser.add_argument(
+        '--no-reset', dest='reset', action='store_false',
+        help='do not reset the device when connecting')
 
     parser = ArgumentParser(
         formatter_class=ArgumentDefaultsHelpFormatter,
@@ -133,6 +326,78 @@ def _arg_parser() -> object:
         help='interface definition file')
     subparser.set_defaults(func=rpc_call)
 
+    subparser = subparsers.add_parser(
+        'watch', formatter_class=ArgumentDefaultsHelpFormatter,
+        parents=[common_parser], description=doc_split(rpc_watch))
+    subparser.add_argument(
+        'name', metavar='NAME', type=str, help='command name')
+    subparser.add_argument(
+        'args', metavar='ARG', type=str, nargs='*', help='command parameter')
+    subparser.add_argument(
+        '-l', dest='load', type=FileType('r'), default=None,
+        help='interface definition file')
+    subparser.add_argument(
+        '--hz', dest='hz', type=float, default=1.0,
+        help='number of calls per second')
+    subparser.add_argument(
+        '-n', dest='count', type=int, default=0,
+        help='number of calls (0 for no limit)')
+    subparser.set_defaults(func=rpc_watch)
+
+    subparser = subparsers.add_parser(
+        'profile', formatter_class=ArgumentDefaultsHelpFormatter,
+        parents=[common_parser], description=doc_split(rpc_profile))
+    subparser.add_argument(
+        'name', metavar='NAME', type=str, help='command name')
+    subparser.add_argument(
+        'args', metavar='ARG', type=str, nargs='*', help='command parameter')
+    subparser.add_argument(
+        '-l', dest='load', type=FileType('r'), default=None,
+        help='interface definition file')
+    subparser.add_argument(
+        '-n', dest='count', type=int, default=100, help='number of calls')
+    subparser.set_defaults(func=rpc_profile)
+
+    subparser = subparsers.add_parser(
+        'codegen', formatter_class=ArgumentDefaultsHelpFormatter,
+        description=doc_split(rpc_codegen))
+    subparser.add_argument(
+        'source', metavar='DEVICE', type=str,
+        help='device or interface definition file')
+    subparser.add_argument(
+        '-o', dest='output', type=str, required=True,
+        help='client module')
+    subparser.add_argument(
+        '-b', dest='baudrate', type=int, default=9600,
+        help='baud rate (0 for automatic negotiation)')
+    subparser.add_argument(
+        '-w', dest='wait', type=int, default=2,
+        help='time before communication starts')
+    subparser.add_argument(
+        '-n', dest='name', type=str, default='Client', help='class name')
+    subparser.set_defaults(func=rpc_codegen)
+
+    subparser = subparsers.add_parser(
+        'scan', formatter_class=ArgumentDefaultsHelpFormatter,
+        parents=[output_parser], description=doc_split(rpc_scan))
+    subparser.add_argument(
+        'devices', metavar='DEVICE', type=str, nargs='*', help='device')
+    subparser.add_argument(
+        '-b', dest='baudrate', type=int, default=9600, help='baud rate')
+    subparser.add_argument(
+        '-w', dest='wait', type=int, default=2,
+        help='time before communication starts')
+    subparser.add_argument(
+        '-t', dest='timeout', type=float, default=1.0,
+        help='time to wait for a response')
+    subparser.add_argument(
+        '-s', dest='save', type=str, default=None,
+        help='directory for interface definition files')
+    subparser.add_argument(
+        '--no-reset', dest='reset', action='store_false',
+        help='do not reset the devices when connecting')
+    subparser.set_defaults(func=rpc_scan)
+
     return parser
 
 
@@ -0,0 +1,156 @@
+from collections import deque
+from struct import calcsize
+from time import perf_counter
+from typing import Any, NamedTuple
+
+
+class Stamped(NamedTuple):
+    """Return value of a method with the time the device received the call.
+
+    `time` is on the host clock (`time.perf_counter()`), `device_time` is the
+    same moment on the device clock, both are in seconds.
+    """
+    result: Any
+    time: float
+    device_time: float
+
+
+class ClockSync(object):
+    """Relation between a device clock and the host clock.
+
+    The device clock is read with a method that returns a tick counter, e.g.,
+    `millis()`. Every synchronisation reads the clock a number of times and
+    keeps the reading with the shortest round trip time, which is the least
+    affected by transmission delays. The offset and drift are estimated with
+    a least squares fit over the kept readings of recent synchronisations.
+    """
+    def __init__(
+            self: object, interface: object, name: str,
+            resolution: float=0.001, interval: float=10, samples: int=8,
+            history: int=16) -> None:
+        """
+        :arg interface: Interface.
+        :arg name: Name of the method that returns the device time in ticks.
+        :arg resolution: Time in seconds per tick, e.g., 0.001 for
+            `millis()`.
+        :arg interval: Time in seconds between synchronisations (0 to only
+            synchronise when `sync()` is called).
+        :arg samples: Number of clock readings per synchronisation.
+        :arg history: Number of synchronisations used for the estimates.
+        """
+        method = interface._method(name, ())
+        fmt = method['return']['fmt']
+        if not isinstance(fmt, str) or len(fmt) != 1 or (
+                fmt not in 'bBhHiIlLqQ'):
+            raise ValueError('not a clock method: {}'.format(name))
+        if samples <= 0:
+            raise ValueError('samples must be positive')
+
+        self.interface = interface
+        self.name = name
+        self.resolution = resolution
+        self.interval = interval
+        self.samples = samples
+
+        self.offset = 0.0
+        self.drift = 0.0
+        self.latency = 0.0
+
+        self._wrap = 1 << (8 * calcsize(fmt))
+        self._raw = None
+        self._ticks = 0
+        self._points = deque(maxlen=history)
+        self._synced = None
+
+    def _read(self: object) -> tuple:
+        """Read the device clock.
+
+        :returns: Host times before and after the call and device time.
+        """
+        start = perf_counter()
+        raw = self.interface.call_method(self.name)
+        end = perf_counter()
+
+        if self._raw is None:
+            self._ticks = raw
+        else:
+            self._ticks += (raw - self._raw) % self._wrap
+        self._raw = raw
+
+        return start, end, self._ticks * self.resolution
+
+    def _fit(self: object) -> None:
+        """Estimate the offset and drift from the kept readings."""
+        count = len(self._points)
+        mean_time = sum(time for time, _ in self._points) / count
+        mean_offset = sum(offset for _, offset in self._points) / count
+
+        variance = sum((time - mean_time) ** 2 for time, _ in self._points)
+        if variance:
+            self.drift = sum(
+                (time - mean_time) * (offset - mean_offset)
+                for time, offset in self._points) / variance
+        else:
+            self.drift = 0.0
+
+        time = self._points[-1][0]
+        self.offset = mean_offset + self.drift * (time - mean_time)
+        self._synced = time
+
+    def _assert_synced(self: object) -> None:
+        if self._synced is None:
+            raise ValueError('clock not synchronised')
+
+    def sync(self: object) -> None:
+        """Synchronise with the device clock."""
+        start, end, device_time = min(
+            (self._read() for _ in range(self.samples)),
+            key=lambda x: x[1] - x[0])
+
+        self.latency = (end - start) / 2
+        time = start + self.latency
+        self._points.append((time, device_time - time))
+        self._fit()
+
+    def device_time(self: object, time: float) -> float:
+        """Convert a host time to a device time.
+
+        :arg time: Host time (`time.perf_counter()`).
+
+        :returns: Device time.
+        """
+        self._assert_synced()
+        return time + self.offset + self.drift * (time - self._synced)
+
+    def host_time(self: object, device_time: float) -> float:
+        """Convert a device time to a host time, e.g., for a timestamp that
+        was returned by the device.
+
+        :arg device_time: Device time.
+
+        :returns: Host time (`time.perf_counter()`).
+        """
+        self._assert_synced()
+        return (
+            device_time - self.offset + self.drift * self._synced) / (
+            1 + self.drift)
+
+    def call_method(self: object, name: str, *args: Any) -> Stamped:
+        """Execute a method and timestamp the result, synchronise first when
+        the last synchronisation is too old.
+
+        :arg name: Method name.
+        :arg args: Method parameters.
+
+        :returns: Return value of the method with timestamps.
+        """
+        start = perf_counter()
+        if self._synced is None or (
+                self.interval and start - self._synced > self.interval):
+            self.sync()
+            start = perf_counter()
+
+        result = self.interface.call_method(name, *args)
+        time = start + self.latency
+
+        return Stamped(result, time, self.device_time(time))
@@ -0,0 +1,135 @@
+from threading import RLock, Timer
+from typing import Any
+
+from .extras import _MethodForwarder
+
+
+def _hashable(obj: Any) -> Any:
+    """Convert lists to tuples, recursively.
+
+    :arg obj: Object.
+
+    :returns: Hashable object.
+    """
+    if isinstance(obj, (list, tuple)):
+        return tuple(map(_hashable, obj))
+    return obj
+
+
+class WriteBehind(_MethodForwarder):
+    """Coalesce calls to setter methods.
+
+    Calls to registered void methods are buffered, only the last call for a
+    method and key (the first parameters of the call) is kept. Buffered
+    calls are sent in one write after {interval} seconds, when `flush()` is
+    called or before a getter that depends on them is called. All other
+    methods are passed through.
+
+    Calls that could not be sent stay buffered. When sending fails after
+    {interval} seconds, the error is raised by the next call to
+    `call_method()` or `flush()`.
+    """
+    def __init__(
+            self: object, interface: object, interval: float=0.05) -> None:
+        """
+        :arg interface: Interface.
+        :arg interval: Time in seconds before buffered calls are sent (0 to
+            send only when `flush()` is called).
+        """
+        self.interface = interface
+        self.interval = interval
+
+        self._setters = {}
+        self._getters = set()
+        self._pending = {}
+        self._lock = RLock()
+        self._timer = None
+        self._error = None
+
+    def __enter__(self: object) -> object:
+        return self
+
+    def __exit__(
+            self: object, exc_type: None, exc_val: None, exc_tb: None) -> None:
+        self.close()
+
+    def add(self: object, name: str, key: int=0, getters: tuple=()) -> None:
+        """Buffer calls to a setter method.
+
+        :arg name: Method name.
+        :arg key: Number of leading parameters that select what is set,
+            e.g., a pin number.
+        :arg getters: Names of methods that read what is set.
+        """
+        method = self.interface.device['methods'].get(name)
+        if not method:
+            raise ValueError('invalid method name: {}'.format(name))
+        if method['return']['fmt']:
+            raise ValueError('not a void method: {}'.format(name))
+        if key > len(method['parameters']):
+            raise ValueError('key larger than number of parameters')
+
+        self._setters[name] = key
+        self._getters.update(getters)
+
+    def call_method(self: object, name: str, *args: Any) -> Any:
+        """Execute a method, calls to setter methods are buffered.
+
+        :arg name: Method name.
+        :arg args: Method parameters.
+
+        :returns: Return value of the method.
+        """
+        with self._lock:
+            self._raise_error()
+            if name in self._setters:
+                self.interface._method(name, args)
+                key = (name, _hashable(args[:self._setters[name]]))
+                self._pending.pop(key, None)
+                self._pending[key] = args
+                if self.interval and not self._timer:
+                    self._timer = Timer(self.interval, self._flush_later)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return None
+
+            if name in self._getters:
+                self.flush()
+            return self.interface.call_method(name, *args)
+
+    def _raise_error(self: object) -> None:
+        """Raise the error of the last timed flush, if any."""
+        if self._error:
+            error, self._error = self._error, None
+            raise error
+
+    def _flush_later(self: object) -> None:
+        """Send all buffered calls from the timer thread, errors are raised
+        by the next call."""
+        try:
+            self.flush()
+        except Exception as error:
+            self._error = error
+
+    def flush(self: object) -> int:
+        """Send all buffered calls, the calls stay buffered when this fails.
+
+        :returns: Number of calls sent.
+        """
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            self._raise_error()
+
+            calls = [(name, args) for (name, _), args in self._pending.items()]
+            if calls:
+                self.interface.call_methods(calls)
+            self._pending.clear()
+
+        return len(calls)
+
+    def close(self: object) -> None:
+        """Send all buffered calls and stop buffering."""
+        self.flush()
+        self._setters.clear()
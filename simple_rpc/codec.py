@@ -0,0 +1,123 @@
+from typing import Any, Iterator, Optional
+
+from .io import _reserve, _struct
+from .protocol import _type_str, type_info
+
+
+def _fmt(obj_type: Any) -> Optional[str]:
+    """Struct format of a type object, if it has a fixed size.
+
+    :arg obj_type: Type object.
+
+    :returns: Struct format without endianness or None.
+    """
+    return type_info(_type_str(obj_type).encode('utf-8')).fmt
+
+
+def _flatten(obj_type: Any, obj: Any) -> Iterator:
+    """Flatten an object of fixed size type.
+
+    :arg obj_type: Type object.
+    :arg obj: Object of type {obj_type}.
+
+    :returns: Iterator over basic values.
+    """
+    if isinstance(obj_type, tuple):
+        for item_type, item in zip(obj_type, obj):
+            yield from _flatten(item_type, item)
+    else:
+        yield obj
+
+
+def _structure(obj_type: Any, values: Iterator) -> Any:
+    """Make an object of fixed size type from basic values.
+
+    :arg obj_type: Type object.
+    :arg values: Iterator over basic values.
+
+    :returns: Object of type {obj_type}.
+    """
+    if isinstance(obj_type, tuple):
+        return tuple(_structure(item, values) for item in obj_type)
+    return next(values)
+
+
+class Codec(object):
+    """Precompiled encoder and decoder for a method with fixed size types.
+
+    The request (method selection and all parameters) is encoded with one
+    `pack_into` call and the response is decoded with one `unpack_from`
+    call.
+    """
+    def __init__(
+            self: object, endianness: str, method: dict,
+            request_fmt: str, response_fmt: str) -> None:
+        """
+        :arg endianness: Endianness.
+        :arg method: Method object.
+        :arg request_fmt: Struct format of all parameters.
+        :arg response_fmt: Struct format of the return value.
+        """
+        self._index = method['index']
+        self._parameter_types = tuple(
+            map(lambda x: x['fmt'], method['parameters']))
+        self._return_type = method['return']['fmt']
+
+        self._request = _struct(endianness + 'B' + request_fmt)
+        self._response = _struct(endianness + (response_fmt or 'B'))
+        self._nested = any(map(
+            lambda x: isinstance(x, tuple), self._parameter_types))
+
+        self.request_size = self._request.size
+        self.response_size = self._response.size
+
+    @classmethod
+    def compile(
+            cls: object, endianness: str, method: dict) -> Optional[object]:
+        """Make a codec for a method if all its types have a fixed size.
+
+        :arg endianness: Endianness.
+        :arg method: Method object.
+
+        :returns: Codec or None.
+        """
+        fmts = [_fmt(parameter['fmt']) for parameter in method['parameters']]
+        response_fmt = _fmt(method['return']['fmt'])
+
+        if None in fmts or response_fmt is None:
+            return None
+        return cls(endianness, method, ''.join(fmts), response_fmt)
+
+    def encode_into(
+            self: object, buffer: bytearray, offset: int, args: tuple) -> int:
+        """Encode a request into a reusable buffer.
+
+        :arg buffer: Buffer, enlarged if needed.
+        :arg offset: Position in {buffer}.
+        :arg args: Method parameters.
+
+        :returns: Position in {buffer} after the request.
+        """
+        if self._nested:
+            args = [
+                value for obj_type, arg in zip(self._parameter_types, args)
+                for value in _flatten(obj_type, arg)]
+        _reserve(buffer, offset + self.request_size)
+        self._request.pack_into(buffer, offset, self._index, *args)
+
+        return offset + self.request_size
+
+    def decode(self: object, data: bytes) -> Any:
+        """Decode a response.
+
+        :arg data: Response of {response_size} bytes.
+
+        :returns: Return value of the method.
+        """
+        values = self._response.unpack_from(data)
+
+        if not self._return_type:
+            return None
+        if isinstance(self._return_type, tuple):
+            return _structure(self._return_type, iter(values))
+        return values[0]
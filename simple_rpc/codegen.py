@@ -0,0 +1,284 @@
+from pprint import pformat
+from typing import Any, Iterator, TextIO
+
+from .codec import _fmt
+from .extras import _make_docstring
+from .protocol import device_fingerprint, fingerprint
+from .simple_rpc import SerialInterface, _protocol
+
+
+_module_template = '''"""{protocol} client, generated by `simple_rpc codegen`.
+
+Regenerate this module when the device interface changes.
+"""
+from struct import Struct, error as _StructError
+
+from simple_rpc.codegen import GeneratedInterface
+from simple_rpc.io import (
+    read as _read, read_into as _read_into, write_into as _write_into)
+
+{structs}
+
+class {name}(GeneratedInterface):
+    """Generated simpleRPC interface."""
+    fingerprint = {fingerprint}
+    definition = (
+        {definition})
+{methods}'''
+
+_stub_template = '''from typing import Any, List, Tuple
+
+from simple_rpc.codegen import GeneratedInterface
+
+
+class {name}(GeneratedInterface):
+{methods}'''
+
+# Local names start with an underscore, so they do not clash with parameters.
+_method_template = '''
+    def {name}(self{args}):
+        """{doc}
+        """
+        if {condition}:
+            return self.call_method('{name}'{args})
+{encode}        try:
+{request}
+        except IOError as _error:
+            self._reconnect_call(_error, False)
+            return self.call_method('{name}'{args})
+        try:
+{response}
+        except TimeoutError as _error:
+            self._recover(_error)
+        except IOError as _error:
+            self._reconnect_call(_error, True)
+            return self.call_method('{name}'{args})
+'''
+
+_python_types = {'?': 'bool', 'c': 'bytes', 'd': 'float', 'f': 'float',
+                 's': 'bytes'}
+
+
+class GeneratedInterface(SerialInterface):
+    """Base class for generated simpleRPC interfaces.
+
+    The interface definition is part of the generated module, the device is
+    only asked for its method list to check that it matches.
+    """
+    fingerprint = 0
+    definition = {'methods': {}}
+
+    def open(self: object, handle: TextIO=None) -> None:
+        """Connect to device and check that it matches the generated
+        definition.
+
+        :arg handle: Not supported, the generated definition is used.
+        """
+        if handle:
+            raise ValueError('generated interfaces can not load definitions')
+
+        self._open()
+        version, endianness, size_t, lines = self._start() or self._probe()
+        if fingerprint(endianness, size_t, lines) != self.fingerprint:
+            self._close()
+            raise ValueError(
+                'device interface does not match the generated client')
+
+        self._fingerprint = self.fingerprint
+        self.device = dict(
+            self.definition, version=version,
+            methods=dict(self.definition['methods']))
+
+
+def _indent(text: str, depth: int) -> str:
+    return '\n'.join(map(
+        lambda x: x and ' ' * depth + x, text.split('\n'))).lstrip()
+
+
+def _escape(doc: str) -> str:
+    return doc.replace('\\', '\\\\').replace('"""', '\\"\\"\\"')
+
+
+def _flat_args(obj_type: Any, expression: str) -> Iterator:
+    """Expressions for the basic values of a fixed size object.
+
+    :arg obj_type: Type object.
+    :arg expression: Expression for the object.
+
+    :returns: Iterator over expressions.
+    """
+    if isinstance(obj_type, tuple):
+        for index, item in enumerate(obj_type):
+            yield from _flat_args(item, '{}[{}]'.format(expression, index))
+    else:
+        yield expression
+
+
+def _structure(obj_type: Any, indices: Iterator) -> str:
+    """Expression for a fixed size object made from unpacked values.
+
+    :arg obj_type: Type object.
+    :arg indices: Iterator over positions in the unpacked values.
+
+    :returns: Expression.
+    """
+    if isinstance(obj_type, tuple):
+        return '({}{})'.format(
+            ', '.join(_structure(item, indices) for item in obj_type),
+            ',' * (len(obj_type) == 1))
+    return '_values[{}]'.format(next(indices))
+
+
+def _python_type(obj_type: Any) -> str:
+    """Type annotation of a C object type.
+
+    :arg obj_type: C object type.
+
+    :returns: Type annotation.
+    """
+    if not obj_type:
+        return 'None'
+    if isinstance(obj_type, list):
+        items = set(map(_python_type, obj_type))
+        if len(items) == 1:
+            return 'List[{}]'.format(items.pop())
+        return 'List[Any]'
+    if isinstance(obj_type, tuple):
+        return 'Tuple[{}]'.format(', '.join(map(_python_type, obj_type)))
+    return _python_types.get(obj_type, 'int')
+
+
+def _method_code(endianness: str, size_t: str, method: dict) -> tuple:
+    """Make the code of a member function with inlined encoding and
+    decoding.
+
+    :arg endianness: Endianness.
+    :arg size_t: Type of size_t.
+    :arg method: Method object.
+
+    :returns: Module level definitions and member function.
+    """
+    name = method['name']
+    parameters = method['parameters']
+    structs = ''
+
+    args = ''.join(map(lambda x: ', ' + x['name'], parameters))
+    encode = ''
+
+    # Values that do not fit the struct format, e.g., a float for an integer
+    # parameter, are converted by `call_method()`.
+    fmts = [_fmt(parameter['fmt']) for parameter in parameters]
+    if None not in fmts:
+        structs += '_{}_request = Struct({!r})\n'.format(
+            name, endianness + 'B' + ''.join(fmts))
+        encode = (
+            '        try:\n'
+            '            _request = _{}_request.pack({})\n'
+            '        except _StructError:\n'
+            '            return self.call_method({!r}{})\n').format(
+            name, ', '.join([str(method['index'])] + [
+                value for parameter in parameters
+                for value in _flat_args(
+                    parameter['fmt'], parameter['name'])]), name, args)
+        request = '            self._connection.write(_request)'
+    else:
+        request = (
+            '            _buffer = self._send_buffer\n'
+            '            _size = _write_into(\n'
+            '                _buffer, 0, {!r}, {!r}, \'B\', {})').format(
+            endianness, size_t, method['index'])
+        for parameter in parameters:
+            request += (
+                '\n            _size = _write_into(\n'
+                '                _buffer, _size, {!r}, {!r}, {!r}, {})'
+                ).format(
+                endianness, size_t, parameter['fmt'], parameter['name'])
+        request += (
+            '\n            self._connection.write('
+            'memoryview(_buffer)[:_size])')
+
+    return_type = method['return']['fmt']
+    response_fmt = _fmt(return_type)
+    if response_fmt is not None:
+        structs += '_{}_response = Struct({!r})\n'.format(
+            name, endianness + (response_fmt or 'B'))
+        response = (
+            '            {0}_{1}_response.unpack(_read_into(\n'
+            '                self._connection, self._receive_buffer,\n'
+            '                _{1}_response.size))').format(
+            '_values = ' if return_type else '', name)
+        if return_type:
+            response += '\n            return {}'.format(
+                _structure(return_type, iter(range(len(response_fmt)))))
+    else:
+        response = (
+            '            return _read(\n'
+            '                self._connection, {!r}, {!r}, {!r},\n'
+            '                self._receive_buffer)').format(
+            endianness, size_t, return_type)
+
+    # Responses that take more than one read need a deadline when a timeout
+    # is set, which is handled by `call_method()`.
+    condition = 'self._desynchronised or self._pending_acks'
+    if not return_type:
+        condition += ' or self._nowait'
+    elif response_fmt is None:
+        condition += ' or self._timeout is not None'
+
+    return structs, _method_template.format(
+        condition=condition,
+        name=name,
+        args=args,
+        encode=encode,
+        doc=_indent(_escape(_make_docstring(method)), 8),
+        request=request,
+        response=response)
+
+
+def generate(device: dict, name: str='Client') -> str:
+    """Make a client module for an interface definition.
+
+    :arg device: Interface definition.
+    :arg name: Class name.
+
+    :returns: Python module.
+    """
+    structs = ''
+    methods = ''
+    for method in sorted(
+            device['methods'].values(), key=lambda x: x['index']):
+        method_structs, method_code = _method_code(
+            device['endianness'], device['size_t'], method)
+        structs += method_structs
+        methods += method_code
+
+    return _module_template.format(
+        protocol=_protocol,
+        name=name,
+        structs=structs,
+        fingerprint=device_fingerprint(device),
+        definition=_indent(pformat(
+            dict(device, methods=dict(device['methods'])), width=70), 8),
+        methods=methods)
+
+
+def generate_stub(device: dict, name: str='Client') -> str:
+    """Make a type stub for a generated client module.
+
+    :arg device: Interface definition.
+    :arg name: Class name.
+
+    :returns: Type stub.
+    """
+    methods = ''
+    for method in sorted(
+            device['methods'].values(), key=lambda x: x['index']):
+        methods += '    def {}(self{}) -> {}: ...\n'.format(
+            method['name'],
+            ''.join(map(
+                lambda x: ', {}: {}'.format(
+                    x['name'], _python_type(x['fmt'])),
+                method['parameters'])),
+            _python_type(method['return']['fmt']))
+
+    return _stub_template.format(name=name, methods=methods or '    pass\n')
@@ -1,3 +1,7 @@
+from copy import deepcopy
+from typing import Any, Optional
+
+
 _method_template = '''
 def {name}(self{args}):
     """{doc}"""
@@ -54,6 +58,68 @@ def make_function(method: dict) -> callable:
     return context[method['name']]
 
 
+def _identity(obj: object) -> object:
+    return obj
+
+
+def _decode_string(obj: bytes) -> str:
+    return obj.decode('utf-8')
+
+
+def _encode_string(obj: str) -> bytes:
+    return obj.encode('utf-8')
+
+
+def _converter(obj_type: Any, convert: callable) -> Optional[callable]:
+    """Make a conversion function for objects of a given type.
+
+    :arg obj_type: Type object.
+    :arg convert: Conversion function for strings.
+
+    :returns: Conversion function or None if no conversion is needed.
+    """
+    if isinstance(obj_type, (list, tuple)):
+        converters = [_converter(item, convert) for item in obj_type]
+        if not any(converters):
+            return None
+        converters = [converter or _identity for converter in converters]
+
+        if len(converters) == 1:
+            converter = converters[0]
+            return lambda obj: [converter(item) for item in obj]
+        return lambda obj: [
+            converters[i % len(converters)](item)
+            for i, item in enumerate(obj)]
+    if obj_type in ('c', 's'):
+        return convert
+    return None
+
+
+def json_decoder(obj_type: Any) -> callable:
+    """Make a function that converts objects of a given type to JSON
+    serialisable objects, i.e., that decodes all strings to UTF-8.
+
+    Objects that do not contain strings, like numeric vectors, are not
+    converted at all.
+
+    :arg obj_type: Type object.
+
+    :returns: Conversion function.
+    """
+    return _converter(obj_type, _decode_string) or _identity
+
+
+def json_encoder(obj_type: Any) -> callable:
+    """Make a function that converts JSON objects to objects of a given
+    type, i.e., that binary encodes all strings.
+
+    :arg obj_type: Type object.
+
+    :returns: Conversion function.
+    """
+    return _converter(obj_type, _encode_string) or _identity
+
+
 def json_utf8_decode(obj: object) -> object:
     """Decode all strings in an object to UTF-8.
 
@@ -100,3 +166,90 @@ def object_to_dict(obj: object) -> dict:
     :returns: Dictionary with UTF-8 encoded strings.
     """
     return dict(json_utf8_decode(obj))
+
+
+class _MethodForwarder(object):
+    """Mixin that makes a member function for every method of the device,
+    calls are made with `call_method()`."""
+    def _methods(self: object) -> dict:
+        return self.interface.device['methods']
+
+    def __getattr__(self: object, name: str) -> Any:
+        """Make a member function for a method when it is first used."""
+        if name.startswith('_') or name not in self._methods():
+            raise AttributeError(
+                '{!r} object has no attribute {!r}'.format(
+                    self.__class__.__name__, name))
+
+        def _call(*args: Any) -> Any:
+            return self.call_method(name, *args)
+
+        setattr(self, name, _call)
+
+        return _call
+
+
+class ConfigSync(object):
+    """Push configuration changes to a device.
+
+    The last configuration acknowledged by the device is kept, only entries
+    that differ from it are sent. When the state of the device is unknown
+    (initially, after `invalidate()` or after a failed push), the whole
+    configuration is sent. Entries that are removed from the configuration
+    are not removed from the device.
+    """
+    def __init__(
+            self: object, interface: object, name: str, batch_size: int=0
+            ) -> None:
+        """
+        :arg interface: Interface.
+        :arg name: Name of a method that takes a list of key/value pairs.
+        :arg batch_size: Maximum number of entries per call (0 for no
+            limit).
+        """
+        self._interface = interface
+        self._name = name
+        self._batch_size = batch_size
+
+        self.state = None
+
+    def invalidate(self: object) -> None:
+        """Forget the state of the device, the next push sends the whole
+        configuration."""
+        self.state = None
+
+    def diff(self: object, config: dict) -> dict:
+        """Find the entries that need to be sent.
+
+        :arg config: Configuration.
+
+        :returns: Changed entries.
+        """
+        if self.state is None:
+            return dict(config)
+        return {
+            key: value for key, value in config.items()
+            if key not in self.state or self.state[key] != value}
+
+    def push(self: object, config: dict) -> int:
+        """Send changed entries to the device.
+
+        All entries are sent in one write, split over multiple calls if
+        there are more than {batch_size} entries.
+
+        :arg config: Configuration.
+
+        :returns: Number of entries sent.
+        """
+        changes = list(dict_to_object(self.diff(config)))
+        if not changes:
+            return 0
+
+        size = self._batch_size or len(changes)
+        state, self.state = self.state, None
+        self._interface.call_methods([
+            (self._name, (changes[i:i + size], ))
+            for i in range(0, len(changes), size)])
+        self.state = {**(state or {}), **deepcopy(config)}
+
+        return len(changes)
@@ -1,5 +1,21 @@
+from functools import lru_cache
+from struct import Struct, error as StructError
 from typing import Any, BinaryIO
-from struct import calcsize, pack, unpack
+
+
+@lru_cache(maxsize=256)
+def _struct(fmt: str) -> Struct:
+    return Struct(fmt)
+
+
+def _reserve(buffer: bytearray, size: int) -> None:
+    """Make sure that {buffer} can hold at least {size} bytes.
+
+    :arg buffer: Buffer.
+    :arg size: Size in bytes.
+    """
+    if len(buffer) < size:
+        buffer.extend(bytes(max(size, 2 * len(buffer)) - len(buffer)))
 
 
 def _read_bytes_until(stream: BinaryIO, delimiter: bytes) -> bytes:
@@ -10,24 +26,95 @@ def _read_bytes_until(stream: BinaryIO, delimiter: bytes) -> bytes:
 
     :returns: Byte string.
     """
-    return b''.join(until(lambda x: x == delimiter, stream.read, 1))
+    if hasattr(stream, 'read_until'):
+        data = stream.read_until(delimiter)
+        if not data.endswith(delimiter):
+            raise TimeoutError('expected {!r}, got {!r}'.format(
+                delimiter, data))
+        return data[:-len(delimiter)]
+
+    data = bytearray()
+    while True:
+        char = stream.read(1)
+        if not char:
+            raise TimeoutError('expected {!r}, got {!r}'.format(
+                delimiter, bytes(data)))
+        if char == delimiter:
+            return bytes(data)
+        data += char
+
 
+def read_into(stream: BinaryIO, buffer: bytearray, size: int) -> Any:
+    """Read exactly {size} bytes from a stream.
 
-def _read_basic(stream: BinaryIO, endianness: str, basic_type: str) -> Any:
+    :arg stream: Stream object.
+    :arg buffer: Reusable buffer (enlarged if needed) for streams that
+        support `readinto`, or None.
+    :arg size: Number of bytes.
+
+    :returns: {buffer} or the data that was read.
+    """
+    if buffer is None:
+        data = stream.read(size)
+        length = len(data)
+    else:
+        _reserve(buffer, size)
+        length = stream.readinto(memoryview(buffer)[:size])
+        data = buffer
+    if length != size:
+        raise TimeoutError(
+            'expected {} bytes, got {}'.format(size, length))
+
+    return data
+
+
+def _read_basic(
+        stream: BinaryIO, endianness: str, basic_type: str,
+        buffer: bytearray=None) -> Any:
     """Read a value of basic type from a stream.
 
     :arg stream: Stream object.
     :arg endianness: Endianness.
     :arg basic_type: Type of {value}.
+    :arg buffer: Reusable receive buffer for streams that support
+        `readinto`.
 
     :returns: Value of type {basic_type}.
     """
     if basic_type == 's':
         return _read_bytes_until(stream, b'\0')
 
-    full_type = (endianness + basic_type).encode('utf-8')
+    unpacker = _struct(endianness + basic_type)
+
+    return unpacker.unpack_from(
+        read_into(stream, buffer, unpacker.size))[0]
 
-    return unpack(full_type, stream.read(calcsize(full_type)))[0]
+
+def _write_basic_into(
+        buffer: bytearray, offset: int, endianness: str, basic_type: str,
+        value: Any) -> int:
+    """Write a value of basic type to a buffer.
+
+    :arg buffer: Buffer, enlarged if needed.
+    :arg offset: Position in {buffer}.
+    :arg endianness: Endianness.
+    :arg basic_type: Type of {value}.
+    :arg value: Value to write.
+
+    :returns: Position in {buffer} after {value}.
+    """
+    if basic_type == 's':
+        end = offset + len(value) + 1
+        _reserve(buffer, end)
+        buffer[offset:end - 1] = value
+        buffer[end - 1] = 0
+        return end
+
+    packer = _struct(endianness + basic_type)
+    _reserve(buffer, offset + packer.size)
+    packer.pack_into(buffer, offset, cast(basic_type)(value))
+
+    return offset + packer.size
 
 
 def _write_basic(
@@ -40,13 +127,9 @@ def _write_basic(
     :arg basic_type: Type of {value}.
     :arg value: Value to write.
     """
-    if basic_type == 's':
-        stream.write(value + b'\0')
-        return
-
-    full_type = (endianness + basic_type).encode('utf-8')
-
-    stream.write(pack(full_type, cast(basic_type)(value)))
+    buffer = bytearray()
+    _write_basic_into(buffer, 0, endianness, basic_type, value)
+    stream.write(buffer)
 
 
 def cast(c_type: str) -> object:
@@ -65,33 +148,121 @@ def cast(c_type: str) -> object:
     return int
 
 
+def _vector_fmt(obj_type: list) -> str:
+    """Struct format of one element of a Vector of basic fixed size types.
+
+    :arg obj_type: Type object.
+
+    :returns: Struct format or an empty string.
+    """
+    if all(map(lambda x: isinstance(x, str) and x != 's', obj_type)):
+        return ''.join(obj_type)
+    return ''
+
+
+def _vector_struct(endianness: str, fmt: str, length: int) -> Struct:
+    if len(fmt) == 1:
+        return _struct('{}{}{}'.format(endianness, length, fmt))
+    return _struct(endianness + fmt * length)
+
+
 def read(
-        stream: BinaryIO, endianness: str, size_t: str, obj_type: Any
-        ) -> Any:
+        stream: BinaryIO, endianness: str, size_t: str, obj_type: Any,
+        buffer: bytearray=None) -> Any:
     """Read an object from a stream.
 
     :arg stream: Stream object.
     :arg endianness: Endianness.
     :arg size_t: Type of size_t.
     :arg obj_type: Type object.
+    :arg buffer: Reusable receive buffer for streams that support
+        `readinto`.
 
     :returns: Object of type {obj_type}.
     """
     if isinstance(obj_type, list):
-        length = _read_basic(stream, endianness, size_t)
+        length = _read_basic(stream, endianness, size_t, buffer)
+
+        fmt = _vector_fmt(obj_type)
+        if fmt:
+            unpacker = _vector_struct(endianness, fmt, length)
+            return list(unpacker.unpack_from(
+                read_into(stream, buffer, unpacker.size)))
+
         return [
-            read(stream, endianness, size_t, item) for _ in range(length)
-            for item in obj_type]
+            read(stream, endianness, size_t, item, buffer)
+            for _ in range(length) for item in obj_type]
     if isinstance(obj_type, tuple):
         return tuple(
-            read(stream, endianness, size_t, item) for item in obj_type)
-    return _read_basic(stream, endianness, obj_type)
+            read(stream, endianness, size_t, item, buffer)
+            for item in obj_type)
+    return _read_basic(stream, endianness, obj_type, buffer)
 
 
 def read_byte_string(stream: BinaryIO) -> bytes:
     return _read_bytes_until(stream, b'\0')
 
 
+def read_byte_strings(stream: BinaryIO) -> list:
+    """Read byte strings from a stream until the first empty one.
+
+    All available data is read at once, the number of read calls does not
+    depend on the number of strings. A `TimeoutError` is raised when the
+    stream ends before the empty string is read.
+
+    :arg stream: Stream object.
+
+    :returns: List of byte strings.
+    """
+    data = bytearray()
+
+    while not (data == b'\0' or data.endswith(b'\0\0')):
+        chunk = stream.read(max(1, getattr(stream, 'in_waiting', 0)))
+        if not chunk:
+            raise TimeoutError(
+                'expected an empty string, got {!r}'.format(bytes(data)))
+        data += chunk
+
+    strings = bytes(data).split(b'\0')
+    return strings[:strings.index(b'')]
+
+
+def write_into(
+        buffer: bytearray, offset: int, endianness: str, size_t: str,
+        obj_type: Any, obj: Any) -> int:
+    """Write an object to a reusable buffer.
+
+    :arg buffer: Buffer, enlarged if needed.
+    :arg offset: Position in {buffer}.
+    :arg endianness: Endianness.
+    :arg size_t: Type of size_t.
+    :arg obj_type: Type object.
+    :arg obj: Object of type {obj_type}.
+
+    :returns: Position in {buffer} after {obj}.
+    """
+    if isinstance(obj_type, list):
+        length = len(obj) // len(obj_type)
+        offset = _write_basic_into(buffer, offset, endianness, size_t, length)
+
+        fmt = _vector_fmt(obj_type)
+        if fmt:
+            packer = _vector_struct(endianness, fmt, length)
+            _reserve(buffer, offset + packer.size)
+            try:
+                packer.pack_into(buffer, offset, *obj)
+            except StructError:
+                pass
+            else:
+                return offset + packer.size
+    if isinstance(obj_type, list) or isinstance(obj_type, tuple):
+        for item_type, item in zip(obj_type * len(obj), obj):
+            offset = write_into(
+                buffer, offset, endianness, size_t, item_type, item)
+        return offset
+    return _write_basic_into(buffer, offset, endianness, obj_type, obj)
+
+
 def write(
         stream: BinaryIO, endianness: str, size_t: str, obj_type: Any,
         obj: Any) -> None:
@@ -103,13 +274,9 @@ def write(
     :arg obj_type: Type object.
     :arg obj: Object of type {obj_type}.
     """
-    if isinstance(obj_type, list):
-        _write_basic(stream, endianness, size_t, len(obj) // len(obj_type))
-    if isinstance(obj_type, list) or isinstance(obj_type, tuple):
-        for item_type, item in zip(obj_type * len(obj), obj):
-            write(stream, endianness, size_t, item_type, item)
-    else:
-        _write_basic(stream, endianness, obj_type, obj)
+    buffer = bytearray()
+    stream.write(
+        buffer[:write_into(buffer, 0, endianness, size_t, obj_type, obj)])
 
 
 def until(
@@ -0,0 +1,128 @@
+from collections import deque
+from threading import Condition
+from time import perf_counter
+from typing import Any, NamedTuple
+
+from .extras import _MethodForwarder
+from .profiler import _history, _percentile
+
+
+lanes = ('realtime', 'normal', 'bulk')
+
+
+class LaneStats(NamedTuple):
+    """Latency of recent calls in a lane, times are in seconds."""
+    count: int
+    mean: float
+    p99: float
+    maximum: float
+
+
+class PriorityInterface(_MethodForwarder):
+    """Interface shared by threads with calls in different priority lanes.
+
+    When the connection is released, it is given to the waiting caller in
+    the highest priority lane. Batches in the bulk lane are sent one call at
+    a time, so calls in other lanes can go in between. Member functions for
+    the methods of the device make their calls in the normal lane.
+    """
+    def __init__(self: object, interface: object) -> None:
+        """
+        :arg interface: Interface.
+        """
+        self.interface = interface
+
+        self._condition = Condition()
+        self._busy = False
+        self._waiting = [0] * len(lanes)
+        self._latencies = [deque(maxlen=_history) for _ in lanes]
+        self._counts = [0] * len(lanes)
+
+    def _lane(self: object, lane: str) -> int:
+        if lane not in lanes:
+            raise ValueError('invalid lane: {}'.format(lane))
+        return lanes.index(lane)
+
+    def _acquire(self: object, lane: int) -> None:
+        """Wait until no call is in progress and no caller in a higher
+        priority lane is waiting.
+
+        :arg lane: Lane index.
+        """
+        with self._condition:
+            self._waiting[lane] += 1
+            self._condition.wait_for(
+                lambda: not self._busy and not any(self._waiting[:lane]))
+            self._waiting[lane] -= 1
+            self._busy = True
+
+    def _release(self: object) -> None:
+        with self._condition:
+            self._busy = False
+            self._condition.notify_all()
+
+    def _call(self: object, lane: int, calls: list) -> list:
+        """Execute methods while holding the connection.
+
+        :arg lane: Lane index.
+        :arg calls: List of (name, parameters) tuples.
+
+        :returns: Return values of the methods.
+        """
+        start = perf_counter()
+        self._acquire(lane)
+        try:
+            results = self.interface.call_methods(calls)
+        finally:
+            self._release()
+        with self._condition:
+            self._latencies[lane].append(perf_counter() - start)
+            self._counts[lane] += 1
+
+        return results
+
+    def call_method(
+            self: object, name: str, *args: Any, lane: str='normal') -> Any:
+        """Execute a method.
+
+        :arg name: Method name.
+        :arg args: Method parameters.
+        :arg lane: Priority lane.
+
+        :returns: Return value of the method.
+        """
+        return self._call(self._lane(lane), [(name, args)])[0]
+
+    def call_methods(
+            self: object, calls: list, lane: str='normal') -> list:
+        """Execute a number of methods, in the bulk lane the methods are
+        executed one by one.
+
+        :arg calls: List of (name, parameters) tuples.
+        :arg lane: Priority lane.
+
+        :returns: Return values of the methods.
+        """
+        index = self._lane(lane)
+        if lane != 'bulk':
+            return self._call(index, calls)
+        return [self._call(index, [call])[0] for call in calls]
+
+    def stats(self: object) -> dict:
+        """Get the latency statistics of recent calls, a latency includes
+        the time spent waiting for other calls.
+
+        :returns: Statistics indexed by lane name.
+        """
+        result = {}
+        for lane, latencies, count in zip(
+                lanes, self._latencies, self._counts):
+            values = sorted(latencies)
+            if not values:
+                result[lane] = LaneStats(count, 0.0, 0.0, 0.0)
+                continue
+            result[lane] = LaneStats(
+                count, sum(values) / len(values), _percentile(values, 0.99),
+                values[-1])
+
+        return result
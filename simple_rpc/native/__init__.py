@@ -0,0 +1,5 @@
+from serial import protocol_handler_packages
+
+
+if __name__ not in protocol_handler_packages:
+    protocol_handler_packages.append(__name__)
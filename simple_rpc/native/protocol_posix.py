@@ -0,0 +1,128 @@
+from os import read, readv, write
+from select import POLLIN, POLLOUT, poll
+from time import monotonic
+from urllib.parse import urlsplit
+
+from serial.serialposix import Serial as PosixSerial
+from serial.serialutil import (
+    PortNotOpenError, SerialException, SerialTimeoutException)
+
+
+class Serial(PosixSerial):
+    """Serial port implementation for POSIX serial devices and pseudo
+    terminals with less overhead per read and write.
+
+    Data is read directly into the buffer of the caller and readiness is
+    checked only when no data is available. The low latency mode of the
+    driver is enabled when supported.
+
+    URL format: `posix://<path>`, e.g., `posix:///dev/ttyACM0`.
+    """
+    def open(self: object) -> None:
+        self.port = self.from_url(self.portstr)
+        super().open()
+
+        self._reader = poll()
+        self._reader.register(self.fd, POLLIN)
+        self._reader.register(self.pipe_abort_read_r, POLLIN)
+        self._writer = poll()
+        self._writer.register(self.fd, POLLOUT)
+        try:
+            self.set_low_latency_mode(True)
+        except (NotImplementedError, ValueError):
+            pass
+
+    def from_url(self: object, url: str) -> str:
+        parts = urlsplit(url)
+        if not parts.scheme:
+            return url
+        if parts.scheme != 'posix':
+            raise SerialException(
+                'expected a string in the form "posix://<path>": '
+                'not starting with posix:// ({!r})'.format(parts.scheme))
+
+        return parts.netloc + parts.path
+
+    def _wait(self: object, poller: object, deadline: float) -> list:
+        """Wait until the port is ready.
+
+        :arg poller: Poll object.
+        :arg deadline: Time at which to give up (None to wait forever).
+
+        :returns: Ready file descriptors.
+        """
+        if deadline is None:
+            return [fd for fd, _ in poller.poll()]
+        return [fd for fd, _ in poller.poll(
+            max(0, deadline - monotonic()) * 1000)]
+
+    def readinto(self: object, buffer: bytearray) -> int:
+        """Read bytes into a buffer, fewer bytes are read if the timeout
+        expires or the read is cancelled.
+
+        :arg buffer: Buffer.
+
+        :returns: Number of bytes read.
+        """
+        if not self.is_open:
+            raise PortNotOpenError()
+        view = memoryview(buffer).cast('B')
+        size = len(view)
+        deadline = None
+        if self._timeout is not None:
+            deadline = monotonic() + self._timeout
+
+        received = 0
+        ready = False
+        while received < size:
+            try:
+                count = readv(self.fd, [view[received:]])
+            except BlockingIOError:
+                count = None
+            except OSError as error:
+                raise SerialException('read failed: {}'.format(error))
+            if count == 0 and ready:
+                raise SerialException(
+                    'device reports readiness to read but returned no data '
+                    '(device disconnected or multiple access on port?)')
+            if count:
+                received += count
+                ready = False
+                continue
+
+            if self._timeout == 0:
+                break
+            ready_fds = self._wait(self._reader, deadline)
+            if self.pipe_abort_read_r in ready_fds:
+                read(self.pipe_abort_read_r, 1000)
+                break
+            if not ready_fds:
+                break
+            ready = True
+
+        return received
+
+    def read(self: object, size: int=1) -> bytes:
+        buffer = bytearray(size)
+
+        return bytes(memoryview(buffer)[:self.readinto(buffer)])
+
+    def write(self: object, data: bytes) -> int:
+        if not self.is_open:
+            raise PortNotOpenError()
+        view = memoryview(data).cast('B')
+        size = len(view)
+        deadline = None
+        if self._write_timeout is not None:
+            deadline = monotonic() + self._write_timeout
+
+        while view:
+            try:
+                view = view[write(self.fd, view):]
+            except BlockingIOError:
+                if not self._wait(self._writer, deadline):
+                    raise SerialTimeoutException('Write timeout')
+            except OSError as error:
+                raise SerialException('write failed: {}'.format(error))
+
+        return size
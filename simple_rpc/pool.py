@@ -0,0 +1,234 @@
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from os import cpu_count
+from typing import Any
+
+from .simple_rpc import Interface
+
+
+def _definition(interface: object) -> dict:
+    return dict(interface.device, methods=dict(interface.device['methods']))
+
+
+def _call(interface: object, calls: list) -> tuple:
+    """Execute a number of methods on one device.
+
+    :arg interface: Interface.
+    :arg calls: List of (name, parameters) tuples.
+
+    :returns: (success, value) tuple, where value is the list of return
+        values or the exception when the call failed.
+    """
+    try:
+        return True, interface.call_methods(calls)
+    except Exception as error:
+        return False, error
+
+
+def _worker(connection: Connection, devices: dict, kwargs: dict) -> None:
+    """Worker process, owns the interfaces of a subset of the devices.
+
+    Every request is answered with a (success, value) tuple, where value is
+    an exception when the request failed. Calls are answered per device, so
+    a failing device does not affect the results of the others.
+
+    :arg connection: Connection to the front end.
+    :arg devices: Interface definitions (or None) indexed by device name.
+    :arg kwargs: Interface constructor parameters.
+    """
+    interfaces = {}
+    try:
+        for device, definition in devices.items():
+            interfaces[device] = Interface(device, load=definition, **kwargs)
+    except Exception as error:
+        connection.send((False, error))
+        return
+    connection.send((True, None))
+
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+
+        command, batches = request
+        try:
+            if command == 'call':
+                result = [
+                    _call(interfaces[device], calls)
+                    for device, calls in batches]
+            else:
+                result = dict(map(
+                    lambda x: (x[0], _definition(x[1])), interfaces.items()))
+        except Exception as error:
+            connection.send((False, error))
+        else:
+            connection.send((True, result))
+
+    for interface in interfaces.values():
+        interface.close()
+
+
+class DevicePool(object):
+    """Devices divided over a number of worker processes.
+
+    Every worker process owns the interfaces of its devices, so encoding
+    and decoding for different devices happens in parallel. Calls are sent
+    to the workers and results are returned over pipes.
+    """
+    def __init__(
+            self: object, devices: list, processes: int=0,
+            definitions: dict=None, **kwargs: Any) -> None:
+        """
+        :arg devices: Device names.
+        :arg processes: Number of worker processes (0 for one per CPU).
+        :arg definitions: Interface definitions indexed by device name,
+            devices with a definition are not queried when connecting.
+        :arg kwargs: Interface constructor parameters.
+        """
+        if not devices:
+            raise ValueError('no devices given')
+        self.devices = list(devices)
+        definitions = definitions or {}
+
+        processes = min(processes or cpu_count(), len(self.devices))
+        shards = [{} for _ in range(processes)]
+        self._shard = {}
+        for index, device in enumerate(self.devices):
+            shards[index % processes][device] = definitions.get(device)
+            self._shard[device] = index % processes
+
+        self._workers = []
+        for shard in shards:
+            connection, child_connection = Pipe()
+            process = Process(
+                target=_worker, args=(child_connection, shard, kwargs),
+                daemon=True)
+            process.start()
+            self._workers.append((connection, process))
+
+        try:
+            self._receive(range(processes))
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self: object) -> object:
+        return self
+
+    def __exit__(
+            self: object, exc_type: None, exc_val: None, exc_tb: None) -> None:
+        self.close()
+
+    def _receive(self: object, workers: list) -> list:
+        """Receive the answers of a number of workers.
+
+        All answers are received before an error is raised, to keep the
+        workers in sync.
+
+        :arg workers: Worker indices.
+
+        :returns: Answers.
+        """
+        answers = [self._workers[worker][0].recv() for worker in workers]
+        for success, value in answers:
+            if not success:
+                raise value
+
+        return [value for _, value in answers]
+
+    def close(self: object) -> None:
+        """Close all interfaces and stop the worker processes."""
+        for connection, process in self._workers:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            process.join()
+            connection.close()
+        self._workers = []
+
+    def call_many(
+            self: object, calls: list, return_exceptions: bool=False) -> list:
+        """Execute methods on a number of devices in parallel.
+
+        Calls to the same device are executed in the given order, with
+        `call_methods()`. When a device fails, the calls to all other
+        devices are still executed.
+
+        :arg calls: List of (device, name, parameters) tuples.
+        :arg return_exceptions: Return the exception of a failed device in
+            place of the return values of its calls, instead of raising the
+            first one after all devices are done.
+
+        :returns: Return values of the methods.
+        """
+        batches = {}
+        for position, (device, name, args) in enumerate(calls):
+            if device not in self._shard:
+                raise ValueError('unknown device: {}'.format(device))
+            batches.setdefault(self._shard[device], {}).setdefault(
+                device, []).append((position, (name, tuple(args))))
+
+        for worker, batch in batches.items():
+            self._workers[worker][0].send(('call', [
+                (device, [call for _, call in items])
+                for device, items in batch.items()]))
+
+        results = [None] * len(calls)
+        errors = []
+        for batch, values in zip(
+                batches.values(), self._receive(list(batches))):
+            for items, (success, device_values) in zip(
+                    batch.values(), values):
+                if not success:
+                    errors.append(device_values)
+                    device_values = [device_values] * len(items)
+                for (position, _), value in zip(items, device_values):
+                    results[position] = value
+
+        if errors and not return_exceptions:
+            raise errors[0]
+        return results
+
+    def call_method(self: object, device: str, name: str, *args: Any) -> Any:
+        """Execute a method.
+
+        :arg device: Device name.
+        :arg name: Method name.
+        :arg args: Method parameters.
+
+        :returns: Return value of the method.
+        """
+        return self.call_many([(device, name, args)])[0]
+
+    def broadcast(
+            self: object, name: str, *args: Any,
+            return_exceptions: bool=False) -> dict:
+        """Execute a method on all devices.
+
+        :arg name: Method name.
+        :arg args: Method parameters.
+        :arg return_exceptions: Return the exception of a failed device in
+            place of its return value, instead of raising the first one
+            after all devices are done.
+
+        :returns: Return values indexed by device name.
+        """
+        return dict(zip(self.devices, self.call_many(
+            [(device, name, args) for device in self.devices],
+            return_exceptions)))
+
+    def definitions(self: object) -> dict:
+        """Get the interface definitions of all devices, these can be passed
+        to the constructor to skip querying the devices.
+
+        :returns: Interface definitions indexed by device name.
+        """
+        for connection, _ in self._workers:
+            connection.send(('definitions', None))
+
+        definitions = {}
+        for shard in self._receive(range(len(self._workers))):
+            definitions.update(shard)
+
+        return definitions
@@ -0,0 +1,125 @@
+from io import BytesIO
+from time import perf_counter
+from typing import NamedTuple
+
+from .io import read, write_into
+
+
+_history = 1000
+
+
+class Profile(NamedTuple):
+    """Timing of repeated calls to a method, times are in seconds."""
+    count: int
+    request_size: int
+    response_size: int
+    baudrate: int
+    p50: float
+    p90: float
+    p99: float
+    maximum: float
+    host_time: float
+
+    @property
+    def transfer_time(self: object) -> float:
+        """Time needed to transfer a request and its response at the
+        configured baud rate, assuming ten bits per byte."""
+        return (self.request_size + self.response_size) * 10 / self.baudrate
+
+    @property
+    def device_time(self: object) -> float:
+        """Remaining time, spent on the device, in drivers and in
+        transmission delays."""
+        return max(0.0, self.p50 - self.host_time - self.transfer_time)
+
+    @property
+    def bytes_per_second(self: object) -> float:
+        """Achieved throughput."""
+        return (self.request_size + self.response_size) / self.p50
+
+    @property
+    def utilisation(self: object) -> float:
+        """Fraction of the link capacity in use."""
+        return self.bytes_per_second * 10 / self.baudrate
+
+
+def _percentile(values: list, fraction: float) -> float:
+    """Percentile of sorted values, the nearest rank method is used.
+
+    :arg values: Sorted values.
+    :arg fraction: Percentile as a fraction.
+
+    :returns: Percentile.
+    """
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def _host_time(interface: object, method: dict, args: tuple,
+               response: bytes, count: int) -> float:
+    """Time needed to encode a request and decode a response.
+
+    :arg interface: Interface.
+    :arg method: Method object.
+    :arg args: Method parameters.
+    :arg response: Encoded response.
+    :arg count: Number of repetitions.
+
+    :returns: Time in seconds per call.
+    """
+    endianness = interface.device['endianness']
+    size_t = interface.device['size_t']
+    codec = interface._codec(method)
+    return_type = method['return']['fmt'] or 'B'
+
+    start = perf_counter()
+    for _ in range(count):
+        interface._encode(method, args)
+        if codec:
+            codec.decode(response)
+        else:
+            read(BytesIO(response), endianness, size_t, return_type)
+
+    return (perf_counter() - start) / count
+
+
+def profile(
+        interface: object, name: str, args: tuple=(), count: int=100
+        ) -> Profile:
+    """Call a method repeatedly and measure where the time is spent.
+
+    The host time is measured by encoding the request and decoding the
+    last response without communicating with the device.
+
+    :arg interface: Interface.
+    :arg name: Method name.
+    :arg args: Method parameters.
+    :arg count: Number of calls.
+
+    :returns: Call statistics.
+    """
+    if count <= 0:
+        raise ValueError('count must be positive')
+    method = interface._method(name, args)
+
+    result = interface.call_method(name, *args)
+    latencies = []
+    for _ in range(count):
+        start = perf_counter()
+        result = interface.call_method(name, *args)
+        latencies.append(perf_counter() - start)
+    latencies.sort()
+
+    endianness = interface.device['endianness']
+    size_t = interface.device['size_t']
+    response = bytearray(1)
+    size = 1
+    if method['return']['fmt']:
+        size = write_into(
+            response, 0, endianness, size_t, method['return']['fmt'], result)
+
+    return Profile(
+        count, interface._encode(method, args), size,
+        interface._connection.baudrate, _percentile(latencies, 0.5),
+        _percentile(latencies, 0.9), _percentile(latencies, 0.99),
+        latencies[-1],
+        _host_time(interface, method, args, bytes(response[:size]), count))
@@ -1,32 +1,47 @@
-from typing import Any, BinaryIO
+from collections.abc import Mapping
+from functools import lru_cache
+from struct import calcsize
+from typing import Any, BinaryIO, Iterator, NamedTuple, Optional
+from zlib import crc32
 
 from .io import cast, read_byte_string
 
 
-def _parse_type(type_str: bytes) -> Any:
-    """Parse a type definition string.
+class _Vector(tuple):
+    """Immutable form of a Vector type."""
+    pass
+
+
+class TypeInfo(NamedTuple):
+    """Parsed type definition."""
+    obj_type: Any
+    size: Optional[int]
+    fmt: Optional[str]
+    name: str
+
+
+def _construct_type(type_str: str) -> Any:
+    """Construct an immutable type object from a type definition string.
 
     :arg type_str: Type definition string.
 
-    :returns: Type object.
+    :returns: Immutable type object.
     """
-    def _construct_type(tokens: tuple):
-        obj_type = []
-
-        for token in tokens:
-            if token == b'[':
-                obj_type.append(_construct_type(tokens))
-            elif token == b'(':
-                obj_type.append(tuple(_construct_type(tokens)))
-            elif token in (b')', b']'):
-                break
-            else:
-                obj_type.append(token.decode())
-
-        return obj_type
+    stack = [('', [])]
 
-    obj_type = _construct_type((bytes([char]) for char in type_str))
+    for char in type_str:
+        if char in '[(':
+            stack.append((char, []))
+        elif char in ')]':
+            if len(stack) == 1:
+                break
+            _close_type(stack)
+        else:
+            stack[-1][1].append(char)
+    while len(stack) > 1:
+        _close_type(stack)
 
+    obj_type = stack[0][1]
     if len(obj_type) > 1:
         raise ValueError('top level type can not be tuple')
     if not obj_type:
@@ -34,6 +49,77 @@ def _parse_type(type_str: bytes) -> Any:
     return obj_type[0]
 
 
+def _close_type(stack: list) -> None:
+    """Close the innermost Vector or Object on a parser stack.
+
+    :arg stack: Parser stack.
+    """
+    opening, items = stack.pop()
+    if opening == '[':
+        stack[-1][1].append(_Vector(items))
+    else:
+        stack[-1][1].append(tuple(items))
+
+
+def _thaw(obj_type: Any) -> Any:
+    """Convert an immutable type object to a type object.
+
+    :arg obj_type: Immutable type object.
+
+    :returns: Type object.
+    """
+    if isinstance(obj_type, _Vector):
+        return [_thaw(item) for item in obj_type]
+    if isinstance(obj_type, tuple):
+        return tuple(_thaw(item) for item in obj_type)
+    return obj_type
+
+
+def _struct_fmt(obj_type: Any) -> Optional[str]:
+    """Struct format of a type object, if it has a fixed size.
+
+    :arg obj_type: Immutable type object.
+
+    :returns: Struct format without endianness or None.
+    """
+    if isinstance(obj_type, _Vector) or obj_type == 's':
+        return None
+    if isinstance(obj_type, tuple):
+        fmts = [_struct_fmt(item) for item in obj_type]
+        if None in fmts:
+            return None
+        return ''.join(fmts)
+    return obj_type
+
+
+@lru_cache(maxsize=256)
+def type_info(type_str: bytes) -> TypeInfo:
+    """Parse a type definition string, the result is cached.
+
+    :arg type_str: Type definition string.
+
+    :returns: Immutable type object, size in bytes (None for variable size
+        types), struct format without endianness (None for variable size
+        types) and Python type name.
+    """
+    obj_type = _construct_type(type_str.decode())
+    fmt = _struct_fmt(obj_type)
+
+    return TypeInfo(
+        obj_type, calcsize('<' + fmt) if fmt is not None else None, fmt,
+        _type_name(obj_type))
+
+
+def _parse_type(type_str: bytes) -> Any:
+    """Parse a type definition string.
+
+    :arg type_str: Type definition string.
+
+    :returns: Type object.
+    """
+    return _thaw(type_info(type_str).obj_type)
+
+
 def _type_name(obj_type: Any) -> str:
     """Python type name of a C object type.
 
@@ -43,13 +129,29 @@ def _type_name(obj_type: Any) -> str:
     """
     if not obj_type:
         return ''
-    if isinstance(obj_type, list):
+    if isinstance(obj_type, (list, _Vector)):
         return '[' + ', '.join([_type_name(item) for item in obj_type]) + ']'
     if isinstance(obj_type, tuple):
         return '(' + ', '.join([_type_name(item) for item in obj_type]) + ')'
     return cast(obj_type).__name__
 
 
+def _type_str(obj_type: Any) -> str:
+    """Type definition string of a C object type.
+
+    :arg obj_type: C object type.
+
+    :returns: Type definition string.
+    """
+    if not obj_type:
+        return ''
+    if isinstance(obj_type, (list, _Vector)):
+        return '[' + ''.join([_type_str(item) for item in obj_type]) + ']'
+    if isinstance(obj_type, tuple):
+        return '(' + ''.join([_type_str(item) for item in obj_type]) + ')'
+    return obj_type
+
+
 def _parse_signature(index: int, signature: bytes) -> dict:
     """Parse a C function signature string.
 
@@ -66,16 +168,17 @@ def _parse_signature(index: int, signature: bytes) -> dict:
         'return': {'doc': ''}}
 
     fmt, parameters = signature.split(b':')
-    method['return']['fmt'] = _parse_type(fmt)
-    method['return']['typename'] = _type_name(method['return']['fmt'])
+    info = type_info(fmt)
+    method['return']['fmt'] = _thaw(info.obj_type)
+    method['return']['typename'] = info.name
 
     for index, fmt in enumerate(parameters.split()):
-        type_ = _parse_type(fmt)
+        info = type_info(fmt)
         method['parameters'].append({
             'doc': '',
             'name': 'arg{}'.format(index),
-            'fmt': type_,
-            'typename': _type_name(type_)})
+            'fmt': _thaw(info.obj_type),
+            'typename': info.name})
 
     return method
 
@@ -127,5 +230,104 @@ def parse_line(index: int, line: bytes) -> dict:
     return method
 
 
+def line_name(index: int, line: bytes) -> str:
+    """Get the method name from a method definition line without parsing it.
+
+    :arg index: Line number.
+    :arg line: Method definition.
+
+    :returns: Method name.
+    """
+    parts = line.split(b';', 1)[1].split(b'@')
+
+    if all(map(lambda x: x.count(b':') == 1, parts)):
+        return parts[0].split(b':')[0].strip().decode('utf-8')
+    return 'method{}'.format(index)
+
+
+class MethodIndex(Mapping):
+    """Method objects indexed by name, parsed when first accessed."""
+    def __init__(self: object, lines: list) -> None:
+        """
+        :arg lines: Method definitions.
+        """
+        self._lines = {}
+        self._methods = {}
+
+        for index, line in enumerate(lines):
+            self._lines[line_name(index, line)] = (index, line)
+
+    def __getitem__(self: object, name: str) -> dict:
+        if name not in self._methods:
+            self._methods[name] = parse_line(*self._lines[name])
+        return self._methods[name]
+
+    def __contains__(self: object, name: str) -> bool:
+        return name in self._lines
+
+    def __iter__(self: object) -> Iterator:
+        return iter(self._lines)
+
+    def __len__(self: object) -> int:
+        return len(self._lines)
+
+    def clear(self: object) -> None:
+        self._lines.clear()
+        self._methods.clear()
+
+
+def make_line(method: dict) -> bytes:
+    """Make a method definition line, the inverse of `parse_line`.
+
+    :arg method: Method object.
+
+    :returns: Method definition.
+    """
+    signature = _type_str(method['return']['fmt']) + ':' + ''.join(
+        map(lambda x: ' ' + _type_str(x['fmt']), method['parameters']))
+
+    description = '{}: {}'.format(method['name'], method['doc'])
+    for parameter in method['parameters']:
+        description += ' @{}: {}'.format(parameter['name'], parameter['doc'])
+    if method['return']['fmt']:
+        description += ' @return: {}'.format(method['return']['doc'])
+
+    return '{};{}'.format(signature, description).encode('utf-8')
+
+
+def fingerprint(endianness: str, size_t: str, lines: list) -> int:
+    """Checksum of everything that determines how methods are called: the
+    endianness, the size_t type and the name and signature of every method.
+    Documentation and white space in signatures are ignored.
+
+    :arg endianness: Endianness.
+    :arg size_t: Type of size_t.
+    :arg lines: Method definitions.
+
+    :returns: Checksum.
+    """
+    checksum = crc32((endianness + size_t).encode('utf-8'))
+    for index, line in enumerate(lines):
+        signature = line.split(b';', 1)[0]
+        checksum = crc32(b'\0'.join([
+            line_name(index, line).encode('utf-8'),
+            b''.join(signature.split())]), checksum)
+
+    return checksum
+
+
+def device_fingerprint(device: dict) -> int:
+    """Compute the fingerprint of an interface definition.
+
+    :arg device: Interface definition.
+
+    :returns: Fingerprint.
+    """
+    methods = sorted(device['methods'].values(), key=lambda x: x['index'])
+
+    return fingerprint(
+        device['endianness'], device['size_t'], list(map(make_line, methods)))
+
+
 def hardware_defs(stream: BinaryIO) -> tuple:
     return tuple(bytes([char]) for char in read_byte_string())
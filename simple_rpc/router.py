@@ -0,0 +1,214 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from threading import Lock
+from time import perf_counter
+from typing import Any, NamedTuple
+
+from .extras import _MethodForwarder
+from .profiler import _history, _percentile
+from .protocol import device_fingerprint
+
+
+_min_samples = 10
+_smoothing = 0.1
+
+
+class BoardStats(NamedTuple):
+    """Load of a board, times are in seconds."""
+    count: int
+    in_flight: int
+    latency: float
+
+
+class Router(_MethodForwarder):
+    """Calls divided over a number of identical boards.
+
+    Every call is sent to the board with the fewest calls in progress, ties
+    are broken by the average latency of the boards. For read-only methods,
+    a duplicate request can be sent to a second board when the first one
+    does not respond within the usual time, the first answer is used.
+    """
+    def __init__(
+            self: object, interfaces: list, hedge: tuple=(),
+            percentile: float=0.95) -> None:
+        """
+        :arg interfaces: Interfaces with the same interface definition.
+        :arg hedge: Names of read-only methods that may be sent to a second
+            board.
+        :arg percentile: Latency percentile (as a fraction) after which a
+            duplicate request is sent.
+        """
+        if not interfaces:
+            raise ValueError('no interfaces given')
+        if len(set(map(
+                lambda x: device_fingerprint(x.device), interfaces))) > 1:
+            raise ValueError('interfaces have different definitions')
+        for name in hedge:
+            if name not in interfaces[0].device['methods']:
+                raise ValueError('invalid method name: {}'.format(name))
+
+        self.interfaces = list(interfaces)
+        self.hedge = set(hedge)
+        self.percentile = percentile
+        self.hedged = 0
+
+        self._lock = Lock()
+        self._locks = [Lock() for _ in self.interfaces]
+        self._in_flight = [0] * len(self.interfaces)
+        self._latencies = [0.0] * len(self.interfaces)
+        self._counts = [0] * len(self.interfaces)
+        self._history = {}
+
+        self._executor = None
+        if self.hedge and len(self.interfaces) > 1:
+            self._executor = ThreadPoolExecutor()
+
+    def _methods(self: object) -> dict:
+        return self.interfaces[0].device['methods']
+
+    def __enter__(self: object) -> object:
+        return self
+
+    def __exit__(
+            self: object, exc_type: None, exc_val: None, exc_tb: None) -> None:
+        self.close()
+
+    def _select(self: object, exclude: int=None) -> int:
+        """Select the least loaded board and register a call.
+
+        :arg exclude: Board that may not be selected.
+
+        :returns: Board index.
+        """
+        with self._lock:
+            index = min(
+                filter(lambda x: x != exclude, range(len(self.interfaces))),
+                key=lambda x: (self._in_flight[x], self._latencies[x]))
+            self._in_flight[index] += 1
+
+        return index
+
+    def _run(self: object, index: int, name: str, function: callable) -> Any:
+        """Make a call on a board that was selected.
+
+        :arg index: Board index.
+        :arg name: Method name (None for a batch of methods).
+        :arg function: Function that makes the call.
+
+        :returns: Result of the function.
+        """
+        start = perf_counter()
+        try:
+            with self._locks[index]:
+                service_start = perf_counter()
+                result = function()
+        finally:
+            with self._lock:
+                self._in_flight[index] -= 1
+        end = perf_counter()
+
+        with self._lock:
+            self._counts[index] += 1
+            if self._counts[index] == 1:
+                self._latencies[index] = end - service_start
+            else:
+                self._latencies[index] += _smoothing * (
+                    end - service_start - self._latencies[index])
+            if name:
+                self._history.setdefault(
+                    name, deque(maxlen=_history)).append(end - start)
+
+        return result
+
+    def _threshold(self: object, name: str) -> float:
+        """Time after which a duplicate request is sent.
+
+        :arg name: Method name.
+
+        :returns: Time in seconds or None if too few calls were made.
+        """
+        with self._lock:
+            values = sorted(self._history.get(name, ()))
+        if len(values) < _min_samples:
+            return None
+
+        return _percentile(values, self.percentile)
+
+    def _hedged_call(self: object, name: str, args: tuple) -> Any:
+        """Execute a method, send a duplicate request to a second board when
+        the first one is slow.
+
+        :arg name: Method name.
+        :arg args: Method parameters.
+
+        :returns: Return value of the method.
+        """
+        threshold = self._threshold(name)
+
+        first = self._select()
+        pending = {self._executor.submit(
+            self._run, first, name,
+            partial(self.interfaces[first].call_method, name, *args))}
+        done, pending = wait(pending, threshold)
+
+        if not done:
+            second = self._select(first)
+            with self._lock:
+                self.hedged += 1
+            pending.add(self._executor.submit(
+                self._run, second, name,
+                partial(self.interfaces[second].call_method, name, *args)))
+
+        while True:
+            for future in done:
+                if not future.exception():
+                    return future.result()
+            if not pending:
+                return done.pop().result()
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    def close(self: object) -> None:
+        """Wait for duplicate requests that are still in progress, the
+        interfaces are not closed."""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def call_method(self: object, name: str, *args: Any) -> Any:
+        """Execute a method on the least loaded board.
+
+        :arg name: Method name.
+        :arg args: Method parameters.
+
+        :returns: Return value of the method.
+        """
+        if name in self.hedge and self._executor:
+            return self._hedged_call(name, args)
+
+        index = self._select()
+        return self._run(
+            index, name,
+            partial(self.interfaces[index].call_method, name, *args))
+
+    def call_methods(self: object, calls: list) -> list:
+        """Execute a number of methods on the least loaded board.
+
+        :arg calls: List of (name, parameters) tuples.
+
+        :returns: Return values of the methods.
+        """
+        index = self._select()
+        return self._run(
+            index, None, partial(self.interfaces[index].call_methods, calls))
+
+    def stats(self: object) -> list:
+        """Get the load of every board, the latency is a moving average of
+        the time needed for a call, not including waiting for other calls.
+
+        :returns: Statistics for every interface.
+        """
+        with self._lock:
+            return [
+                BoardStats(*values) for values in zip(
+                    self._counts, self._in_flight, self._latencies)]
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+
+from .simple_rpc import Interface
+
+
+_patterns = ('/dev/ttyUSB*', '/dev/ttyACM*', '/dev/rfcomm*')
+
+
+def ports(patterns: tuple=_patterns) -> list:
+    """Find serial ports that may have a simpleRPC device attached.
+
+    :arg patterns: Device name patterns.
+
+    :returns: Device names.
+    """
+    return sorted(name for pattern in patterns for name in glob(pattern))
+
+
+def _definition(
+        device: str, baudrate: int, wait: float, timeout: float, reset: bool
+        ) -> dict:
+    """Get the interface definition of a device.
+
+    :arg device: Device name.
+    :arg baudrate: Baud rate.
+    :arg wait: Time in seconds before communication starts.
+    :arg timeout: Time in seconds to wait for a response.
+    :arg reset: Allow the device to be reset when connecting.
+
+    :returns: Interface definition or None if the device does not respond
+        with a valid method list.
+    """
+    try:
+        interface = Interface(
+            device, baudrate, wait, autoconnect=False, timeout=timeout,
+            reset=reset)
+        try:
+            interface.open()
+            return dict(
+                interface.device, methods=dict(interface.device['methods']))
+        finally:
+            interface.close()
+    except (IOError, ValueError):
+        return None
+
+
+def scan(
+        devices: list=None, baudrate: int=9600, wait: float=2,
+        timeout: float=1, reset: bool=True) -> dict:
+    """Find simpleRPC devices, all devices are queried at the same time.
+
+    :arg devices: Device names, e.g., `socket://` URLs (None for all serial
+        ports found by `ports()`).
+    :arg baudrate: Baud rate.
+    :arg wait: Time in seconds before communication starts.
+    :arg timeout: Time in seconds to wait for a response.
+    :arg reset: Allow the devices to be reset when connecting.
+
+    :returns: Interface definitions indexed by device name, devices that do
+        not respond are left out.
+    """
+    if devices is None:
+        devices = ports()
+    if not devices:
+        return {}
+
+    with ThreadPoolExecutor(len(devices)) as executor:
+        definitions = executor.map(
+            lambda x: _definition(x, baudrate, wait, timeout, reset),
+            devices)
+
+        return {
+            device: definition
+            for device, definition in zip(devices, definitions)
+            if definition}
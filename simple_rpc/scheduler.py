@@ -0,0 +1,97 @@
+from time import monotonic, sleep, time
+from typing import Any, NamedTuple
+
+
+class Job(NamedTuple):
+    """Periodic method call."""
+    interface: object
+    name: str
+    args: tuple
+    period: float
+
+
+class Sample(NamedTuple):
+    """Result of a periodic method call."""
+    job: Job
+    time: float
+    result: Any
+    missed: int
+
+
+class Scheduler(object):
+    """Call methods periodically on one or more interfaces.
+
+    Calls that are due at the same time on the same interface are sent in
+    one write. Deadlines are computed from the start time, so the cadence
+    does not drift. When a deadline is missed, the call is made as soon as
+    possible and the number of skipped periods is reported.
+    """
+    def __init__(self: object) -> None:
+        self.jobs = []
+        self.missed = 0
+
+        self._running = False
+
+    def add(
+            self: object, interface: object, name: str, args: tuple=(),
+            period: float=1.0) -> Job:
+        """Add a periodic method call.
+
+        :arg interface: Interface.
+        :arg name: Method name.
+        :arg args: Method parameters.
+        :arg period: Time in seconds between calls.
+
+        :returns: New job.
+        """
+        if period <= 0:
+            raise ValueError('period must be positive')
+        job = Job(interface, name, tuple(args), period)
+        self.jobs.append(job)
+
+        return job
+
+    def stop(self: object) -> None:
+        """Stop running, e.g., from within a callback."""
+        self._running = False
+
+    def run(self: object, callback: callable, count: int=0) -> None:
+        """Call methods periodically.
+
+        :arg callback: Function that receives a `Sample` for every call.
+        :arg count: Stop after this many calls (0 for no limit).
+        """
+        start = monotonic()
+        cycles = [0] * len(self.jobs)
+        calls = 0
+
+        self._running = bool(self.jobs)
+        while self._running:
+            due = [start + self.jobs[i].period * cycles[i]
+                   for i in range(len(self.jobs))]
+            now = monotonic()
+            if min(due) > now:
+                sleep(min(due) - now)
+                now = monotonic()
+
+            bursts = {}
+            for i, job in enumerate(self.jobs):
+                if due[i] <= now:
+                    bursts.setdefault(id(job.interface), []).append(i)
+
+            for indices in bursts.values():
+                results = self.jobs[indices[0]].interface.call_methods(
+                    [(self.jobs[i].name, self.jobs[i].args) for i in indices])
+                timestamp = time()
+
+                for i, result in zip(indices, results):
+                    job = self.jobs[i]
+                    missed = int((now - due[i]) // job.period)
+                    cycles[i] += missed + 1
+                    self.missed += missed
+
+                    callback(Sample(job, timestamp, result, missed))
+                    calls += 1
+                    if calls == count:
+                        self._running = False
+                        return
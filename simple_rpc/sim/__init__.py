@@ -0,0 +1,8 @@
+from serial import protocol_handler_packages
+
+from .device import Device
+from .transport import LocalServer, PtyServer, TcpServer
+
+
+if __name__ not in protocol_handler_packages:
+    protocol_handler_packages.append(__name__)
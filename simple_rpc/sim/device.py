@@ -0,0 +1,133 @@
+from struct import error as StructError
+from typing import Any, BinaryIO
+
+from ..io import read, write
+from ..protocol import make_line, parse_line
+from ..simple_rpc import _list_req, _protocol, _version
+
+
+class Device(object):
+    """Simulated simpleRPC device."""
+    def __init__(
+            self: object, endianness: str='<', size_t: str='H',
+            version: tuple=_version) -> None:
+        """
+        :arg endianness: Endianness.
+        :arg size_t: Type of size_t.
+        :arg version: Protocol version.
+        """
+        self.endianness = endianness
+        self.size_t = size_t
+        self.version = version
+
+        self.methods = []
+        self._functions = []
+
+    def add_method(
+            self: object, f: callable, signature: str, doc: str=None
+            ) -> None:
+        """Export a function.
+
+        :arg f: Function.
+        :arg signature: Function signature, e.g., `B: B H`.
+        :arg doc: Method documentation, e.g., `name: Doc. @a: Param a.`.
+        """
+        if doc is None:
+            doc = '{}: {}'.format(
+                f.__name__, (f.__doc__ or '').split('\n')[0].strip())
+
+        self.methods.append(parse_line(
+            len(self.methods), '{};{}'.format(signature, doc).encode('utf-8')))
+        self._functions.append(f)
+
+    def method(self: object, signature: str, doc: str=None) -> callable:
+        """Decorator for exporting a function.
+
+        :arg signature: Function signature.
+        :arg doc: Method documentation.
+
+        :returns: Decorator.
+        """
+        def _method(f: callable) -> callable:
+            self.add_method(f, signature, doc)
+            return f
+
+        return _method
+
+    def listing(self: object) -> bytes:
+        """Make the response to a method list request.
+
+        :returns: Protocol header, hardware definitions and method lines.
+        """
+        return b''.join([
+            _protocol.encode('utf-8') + b'\0',
+            bytes(self.version),
+            (self.endianness + self.size_t).encode('utf-8') + b'\0',
+            b''.join(map(lambda x: make_line(x) + b'\0', self.methods)),
+            b'\0'])
+
+    def _write(
+            self: object, stream: BinaryIO, obj_type: Any, obj: Any) -> None:
+        write(stream, self.endianness, self.size_t, obj_type, obj)
+
+    def _read(self: object, stream: BinaryIO, obj_type: Any) -> Any:
+        return read(stream, self.endianness, self.size_t, obj_type)
+
+    def handle(self: object, stream: BinaryIO) -> bool:
+        """Handle one remote procedure call.
+
+        :arg stream: Stream object.
+
+        :returns: False if the stream was closed, True otherwise.
+        """
+        data = stream.read(1)
+        if not data:
+            return False
+        index = data[0]
+
+        if index == _list_req:
+            stream.write(self.listing())
+        elif index < len(self.methods):
+            method = self.methods[index]
+
+            args = [
+                self._read(stream, parameter['fmt'])
+                for parameter in method['parameters']]
+            result = self._functions[index](*args)
+
+            if method['return']['fmt']:
+                self._write(stream, method['return']['fmt'], result)
+            else:
+                self._write(stream, 'B', 0)
+        stream.flush()
+
+        return True
+
+    def serve(self: object, stream: BinaryIO) -> None:
+        """Handle remote procedure calls until the stream is closed.
+
+        :arg stream: Stream object.
+        """
+        try:
+            while self.handle(stream):
+                pass
+        except (OSError, StructError):
+            pass
+
+    @classmethod
+    def from_definition(cls: object, device: dict, functions: dict) -> object:
+        """Make a device from an interface definition.
+
+        :arg device: Interface definition.
+        :arg functions: Functions indexed by method name.
+
+        :returns: Simulated device.
+        """
+        simulator = cls(
+            device['endianness'], device['size_t'], device['version'])
+        for method in sorted(
+                device['methods'].values(), key=lambda x: x['index']):
+            signature, doc = make_line(method).decode('utf-8').split(';', 1)
+            simulator.add_method(functions[method['name']], signature, doc)
+
+        return simulator
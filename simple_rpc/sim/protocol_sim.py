@@ -0,0 +1,52 @@
+from socket import SHUT_RDWR
+from urllib.parse import urlsplit
+
+from serial.serialutil import SerialException
+from serial.urlhandler.protocol_socket import Serial as SocketSerial
+
+from .transport import lookup
+
+
+class Serial(SocketSerial):
+    """Serial port implementation for in-process simulated devices.
+
+    URL format: `sim://<name>`.
+    """
+    def open(self: object) -> None:
+        self.logger = None
+        if self._port is None:
+            raise SerialException(
+                'Port must be configured before it can be used.')
+        if self.is_open:
+            raise SerialException('Port is already open.')
+        try:
+            self._socket = lookup(self.from_url(self.portstr)).connect(
+                lambda: self._baudrate)
+        except ValueError as error:
+            raise SerialException(
+                'Could not open port {}: {}'.format(self.portstr, error))
+        self._socket.setblocking(False)
+
+        self._reconfigure_port()
+        self.is_open = True
+        self.reset_input_buffer()
+        self.reset_output_buffer()
+
+    def close(self: object) -> None:
+        if self.is_open:
+            try:
+                self._socket.shutdown(SHUT_RDWR)
+            except OSError:
+                pass
+            self._socket.close()
+            self._socket = None
+            self.is_open = False
+
+    def from_url(self: object, url: str) -> str:
+        parts = urlsplit(url)
+        if parts.scheme != 'sim':
+            raise SerialException(
+                'expected a string in the form "sim://<name>": '
+                'not starting with sim:// ({!r})'.format(parts.scheme))
+
+        return parts.netloc
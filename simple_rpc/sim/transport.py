@@ -0,0 +1,239 @@
+from os import close, openpty, read as os_read, ttyname, write as os_write
+from select import select
+from socket import create_server, socketpair
+from threading import Event, Thread
+from time import sleep
+from tty import setraw
+from typing import Any, Union
+
+from .device import Device
+
+
+_poll_interval = 0.1
+_registry = {}
+
+
+class _Link(object):
+    """Device side of a connection, with baud rate and latency emulation."""
+    def __init__(
+            self: object, fd: Any, recv: callable, send: callable,
+            stopped: Event, baudrate: int=0,
+            latency: Union[float, callable]=0.0,
+            garbled: callable=lambda: False) -> None:
+        """
+        :arg fd: Object with a `fileno()` method, or a file descriptor.
+        :arg recv: Function that receives at most a given number of bytes.
+        :arg send: Function that sends all given bytes.
+        :arg stopped: Stop event.
+        :arg baudrate: Emulated baud rate (0 for no emulation).
+        :arg latency: Delay in seconds before every response, or a function
+            returning such a delay.
+        :arg garbled: Function that tells whether data is corrupted, e.g.,
+            because of a baud rate mismatch.
+        """
+        self._fd = fd
+        self._recv = recv
+        self._send = send
+        self._stopped = stopped
+        self._baudrate = baudrate
+        self._latency = latency
+        self._garbled = garbled
+
+        self._received = 0
+        self._buffer = bytearray()
+
+    def read(self: object, size: int=1) -> bytes:
+        """Read {size} bytes, returns fewer bytes if the link is closed.
+
+        :arg size: Number of bytes.
+
+        :returns: Data.
+        """
+        data = bytearray()
+
+        while len(data) < size and not self._stopped.is_set():
+            if select([self._fd], [], [], _poll_interval)[0]:
+                chunk = self._recv(size - len(data))
+                if not chunk:
+                    break
+                data += chunk
+        self._received += len(data)
+
+        if self._garbled():
+            return bytes(map(lambda x: x ^ 0x55, data))
+        return bytes(data)
+
+    def write(self: object, data: bytes) -> None:
+        self._buffer += data
+
+    def flush(self: object) -> None:
+        """Send the buffered response after the emulated delays."""
+        delay = self._latency() if callable(self._latency) else self._latency
+        if self._baudrate:
+            delay += (self._received + len(self._buffer)) * 10 / self._baudrate
+        if delay:
+            sleep(delay)
+
+        if self._buffer:
+            if self._garbled():
+                self._send(bytes(map(lambda x: x ^ 0x55, self._buffer)))
+            else:
+                self._send(bytes(self._buffer))
+        self._received = 0
+        self._buffer.clear()
+
+
+class _Server(object):
+    """Simulated device server."""
+    def __init__(
+            self: object, device: Device, baudrate: int=0,
+            latency: Union[float, callable]=0.0) -> None:
+        """
+        :arg device: Simulated device.
+        :arg baudrate: Emulated baud rate (0 for no emulation).
+        :arg latency: Delay in seconds before every response, or a function
+            returning such a delay.
+        """
+        self.device = device
+        self.baudrate = baudrate
+        self.latency = latency
+        self.url = ''
+
+        self._stopped = Event()
+        self._threads = []
+
+    def __enter__(self: object) -> object:
+        return self
+
+    def __exit__(
+            self: object, exc_type: None, exc_val: None, exc_tb: None) -> None:
+        self.close()
+
+    def _start(self: object, f: callable, *args: Any) -> None:
+        thread = Thread(target=f, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _serve(
+            self: object, fd: Any, recv: callable, send: callable,
+            garbled: callable=lambda: False) -> None:
+        self.device.serve(_Link(
+            fd, recv, send, self._stopped, self.baudrate, self.latency,
+            garbled))
+
+    def close(self: object) -> None:
+        """Stop serving."""
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+
+
+class PtyServer(_Server):
+    """Simulated device on a pseudo terminal, `url` is the device name."""
+    def __init__(self: object, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        self._master, self._slave = openpty()
+        setraw(self._slave)
+        self.url = ttyname(self._slave)
+
+        self._start(
+            self._serve, self._master, lambda x: os_read(self._master, x),
+            self._send)
+
+    def _send(self: object, data: bytes) -> None:
+        while data:
+            data = data[os_write(self._master, data):]
+
+    def close(self: object) -> None:
+        super().close()
+        close(self._slave)
+        close(self._master)
+
+
+class TcpServer(_Server):
+    """Simulated device on a TCP socket, `url` is a `socket://` URL."""
+    def __init__(
+            self: object, *args: Any, host: str='localhost', port: int=0,
+            **kwargs: Any) -> None:
+        """
+        :arg host: Host name.
+        :arg port: Port number (0 for any free port).
+        """
+        super().__init__(*args, **kwargs)
+
+        self._socket = create_server((host, port))
+        self.url = 'socket://{}:{}'.format(
+            host, self._socket.getsockname()[1])
+
+        self._start(self._accept)
+
+    def _accept(self: object) -> None:
+        while not self._stopped.is_set():
+            if select([self._socket], [], [], _poll_interval)[0]:
+                connection, _ = self._socket.accept()
+                self._start(self._handle, connection)
+
+    def _handle(self: object, connection: object) -> None:
+        with connection:
+            self._serve(connection, connection.recv, connection.sendall)
+
+    def close(self: object) -> None:
+        super().close()
+        self._socket.close()
+
+
+class LocalServer(_Server):
+    """Simulated device in the current process, `url` is a `sim://` URL."""
+    def __init__(
+            self: object, *args: Any, name: str='', baudrates: tuple=(),
+            **kwargs: Any) -> None:
+        """
+        :arg name: Device name (defaults to a unique name).
+        :arg baudrates: Baud rates accepted by the device (empty for all),
+            data is corrupted when the host uses an other baud rate.
+        """
+        super().__init__(*args, **kwargs)
+        self.baudrates = baudrates
+
+        name = name or 'device{}'.format(id(self))
+        if name in _registry:
+            raise ValueError('device name in use: {}'.format(name))
+        _registry[name] = self
+        self._name = name
+        self.url = 'sim://{}'.format(name)
+
+    def connect(self: object, baudrate: callable=lambda: 0) -> object:
+        """Make a new connection to the simulated device.
+
+        :arg baudrate: Function that returns the baud rate of the host.
+
+        :returns: Host side socket.
+        """
+        host, device = socketpair()
+        self._start(self._handle, device, baudrate)
+
+        return host
+
+    def _handle(self: object, connection: object, baudrate: callable) -> None:
+        with connection:
+            self._serve(
+                connection, connection.recv, connection.sendall,
+                lambda: bool(self.baudrates) and (
+                    baudrate() not in self.baudrates))
+
+    def close(self: object) -> None:
+        _registry.pop(self._name, None)
+        super().close()
+
+
+def lookup(name: str) -> LocalServer:
+    """Find a simulated device in the current process.
+
+    :arg name: Device name.
+
+    :returns: Simulated device server.
+    """
+    if name not in _registry:
+        raise ValueError('no such simulated device: {}'.format(name))
+    return _registry[name]
@@ -1,21 +1,40 @@
 from functools import wraps
-from time import sleep
+from struct import error as StructError
+from threading import Event, Lock, RLock, Timer
+from time import monotonic, sleep
 from types import MethodType
-from typing import Any, TextIO
+from typing import Any, TextIO, Union
+from zlib import crc32
+
+try:
+    from termios import HUPCL, TCSANOW, tcgetattr, tcsetattr
+except ImportError:
+    tcgetattr = None
 
 from serial import serial_for_url
-from serial.serialutil import SerialException
+from serial.serialutil import SerialBase, SerialException
 from yaml import FullLoader, dump, load
 
+# Registers the `posix://` URL handler.
+from . import native  # noqa: F401
+from .baudrate import baudrates, negotiate
+from .codec import Codec
 from .extras import make_function
-from .io import read, read_byte_string, until, write
-from .protocol import parse_line
+from .io import (
+    read, read_byte_string, read_byte_strings, read_into, write, write_into)
+from .protocol import MethodIndex, device_fingerprint, fingerprint, parse_line
 
 
 _protocol = 'simpleRPC'
 _version = (4, 0, 0)
 
 _list_req = 0xff
+_buffer_size = 64
+_probe_timeout = 0.1
+_reconnect_interval = 0.1
+
+_shared = {}
+_shared_lock = Lock()
 
 
 def _assert_protocol(protocol: str) -> None:
@@ -31,22 +50,135 @@ def _assert_version(version: tuple) -> None:
                 '.'.join(map(str, _version))))
 
 
+def _has_readinto(connection: object) -> bool:
+    """Check whether a connection reads directly into a buffer.
+
+    :arg connection: Connection object.
+
+    :returns: False if `readinto` is implemented using `read`.
+    """
+    return getattr(
+        type(connection), 'readinto', SerialBase.readinto
+        ) is not SerialBase.readinto
+
+
+def _keep_control_lines(connection: object) -> None:
+    """Leave DTR and RTS asserted when a serial port is closed, so opening
+    it again does not reset the device.
+
+    :arg connection: Open connection object.
+    """
+    if tcgetattr and hasattr(connection, 'fd'):
+        attributes = tcgetattr(connection.fd)
+        attributes[2] &= ~HUPCL
+        tcsetattr(connection.fd, TCSANOW, attributes)
+
+
+class CallTimeoutError(TimeoutError):
+    """A remote procedure call did not finish in time."""
+    pass
+
+
+class _Deadline(object):
+    """Connection wrapper that limits the time of all reads together.
+
+    Before every read, the timeout of the connection is set to the time that
+    is left. Setting the timeout of the wrapper limits it further.
+    """
+    def __init__(self: object, connection: object, timeout: float) -> None:
+        """
+        :arg connection: Connection object.
+        :arg timeout: Time in seconds for all reads together.
+        """
+        self.connection = connection
+        self.deadline = monotonic() + timeout
+        self.limit = None
+
+    def __getattr__(self: object, name: str) -> Any:
+        return getattr(self.connection, name)
+
+    @property
+    def timeout(self: object) -> float:
+        remaining = max(0, self.deadline - monotonic())
+        if self.limit is None:
+            return remaining
+        return min(remaining, self.limit)
+
+    @timeout.setter
+    def timeout(self: object, timeout: float) -> None:
+        self.limit = timeout
+
+    def _update(self: object) -> None:
+        self.connection.timeout = self.timeout
+
+    def read(self: object, size: int=1) -> bytes:
+        self._update()
+        return self.connection.read(size)
+
+    def readinto(self: object, buffer: bytearray) -> int:
+        self._update()
+        return self.connection.readinto(buffer)
+
+    def read_until(
+            self: object, expected: bytes=b'\n', size: int=None) -> bytes:
+        self._update()
+        return self.connection.read_until(expected, size)
+
+
 class _Interface(object):
     """Generic simpleRPC interface."""
     def __init__(
             self: object, device: str, baudrate: int=9600, wait: int=2,
-            autoconnect: bool=True, load: TextIO=None) -> None:
+            autoconnect: bool=True, load: TextIO=None, lazy: bool=False,
+            timeout: float=None, window: int=0, reconnect: float=0,
+            nowait: bool=False, reset: bool=True, retry: bool=False
+            ) -> None:
         """
         :arg device: Device name.
-        :arg baudrate: Baud rate.
+        :arg baudrate: Baud rate (0 for automatic negotiation).
         :arg wait: Time in seconds before communication starts.
         :arg autoconnect: Automatically connect.
-        :arg load: Load interface definition from file.
+        :arg load: Load interface definition from file (or from a
+            dictionary, e.g., the `device` member of an other interface).
+        :arg lazy: Parse method definitions when first used.
+        :arg timeout: Time in seconds to wait for the response of a call,
+            including the resynchronisation after a timeout.
+        :arg window: Maximum number of request bytes sent ahead of the
+            responses, e.g., the size of the receive buffer of the device (0
+            for no limit).
+        :arg reconnect: Time in seconds to wait for the device to come back
+            after it is disconnected (0 to disable automatic reconnection).
+        :arg nowait: Do not wait for the acknowledgement of void methods,
+            acknowledgements are checked before the next method that returns
+            a value or when `sync()` is called.
+        :arg reset: Allow the device to be reset when connecting, when
+            False, the control lines are left alone and the device is
+            queried immediately, {wait} is only used if it does not respond.
+        :arg retry: After reconnecting, also make a call again when its
+            request was written before the connection broke, only use this
+            when all methods can safely be executed twice.
         """
         self._wait = wait
+        self._reconnect_timeout = reconnect
+        self._timeout = timeout
+        self._retry = retry
+        self._request_sent = False
+        self._fingerprint = None
+        self._lazy = lazy
+        self._window = window
+        self._nowait = nowait
+        self._reset = reset
+        self._pending_acks = 0
+        self._pending_size = 0
+        self._autobaud = not baudrate
+        self._codecs = {}
+        self._desynchronised = False
+        self._list_requests = 0
+        self._cancelled = False
 
         self._connection = serial_for_url(
-            device, do_not_open=True, baudrate=baudrate)
+            device, do_not_open=True, baudrate=baudrate or baudrates[-1],
+            timeout=timeout)
         self.device = {
             'endianness': '<',
             'methods': {},
@@ -54,9 +186,43 @@ class _Interface(object):
             'size_t': 'H',
             'version': (0, 0, 0)}
 
+        self._send_buffer = bytearray(_buffer_size)
+        self._receive_buffer = None
+        if _has_readinto(self._connection):
+            self._receive_buffer = bytearray(_buffer_size)
+
         if autoconnect:
             self.open(load)
 
+    def _reconnecting(f: callable) -> callable:
+        """Decorator for automatic reconnection, the call is made again
+        after the device is back (see `_reconnect_call()`)."""
+        @wraps(f)
+        def _reconnecting_wrapper(
+                self: object, *args: Any, **kwargs: Any) -> Any:
+            self._request_sent = False
+            try:
+                return f(self, *args, **kwargs)
+            except IOError as error:
+                self._reconnect_call(error, self._request_sent)
+
+            return f(self, *args, **kwargs)
+
+        return _reconnecting_wrapper
+
+    def __getattr__(self: object, name: str) -> Any:
+        """Make a member function for a method when it is first used."""
+        methods = self.__dict__.get('device', {}).get('methods', {})
+        if name not in methods:
+            raise AttributeError(
+                '{!r} object has no attribute {!r}'.format(
+                    self.__class__.__name__, name))
+
+        function = MethodType(make_function(methods[name]), self)
+        setattr(self, name, function)
+
+        return function
+
     def __enter__(self: object) -> object:
         return self
 
@@ -65,13 +231,20 @@ class _Interface(object):
         self.close()
 
     def _open(self: object) -> None:
+        if not self._reset and not tcgetattr:
+            self._connection.dtr = False
+            self._connection.rts = False
         try:
             self._connection.open()
         except SerialException:
             raise IOError('could not open device')
+        if not self._reset:
+            _keep_control_lines(self._connection)
 
     def _close(self: object) -> None:
         self._connection.close()
+        self._pending_acks = 0
+        self._pending_size = 0
 
     def _select(self: object, index: int) -> None:
         """Initiate a remote procedure call, select the method.
@@ -90,6 +263,112 @@ class _Interface(object):
             self._connection, self.device['endianness'], self.device['size_t'],
             obj_type, obj)
 
+    def _encode(self: object, method: dict, args: tuple, offset: int=0) -> int:
+        """Encode a request (method selection and parameters) into the send
+        buffer.
+
+        :arg method: Method object.
+        :arg args: Method parameters.
+        :arg offset: Position in the send buffer.
+
+        :returns: Position in the send buffer after the request.
+        """
+        # Fixed size types, use one pack call.
+        codec = self._codec(method)
+        if codec:
+            try:
+                return codec.encode_into(self._send_buffer, offset, args)
+            except StructError:
+                pass
+
+        endianness = self.device['endianness']
+        size_t = self.device['size_t']
+
+        offset = write_into(
+            self._send_buffer, offset, endianness, size_t, 'B',
+            method['index'])
+        for parameter, arg in zip(method['parameters'], args):
+            offset = write_into(
+                self._send_buffer, offset, endianness, size_t,
+                parameter['fmt'], arg)
+
+        return offset
+
+    def _send(self: object, size: int, offset: int=0) -> None:
+        """Write the send buffer from {offset} up to {size}.
+
+        :arg size: End position in the send buffer.
+        :arg offset: Start position in the send buffer.
+        """
+        self._connection.write(memoryview(self._send_buffer)[offset:size])
+        self._request_sent = True
+
+    def _exchange(self: object, methods: list, ends: list) -> list:
+        """Write encoded requests and read the responses, without exceeding
+        the window.
+
+        A request is sent as soon as all outstanding requests, including
+        itself, fit in the window. A request that is larger than the window
+        is sent when no requests are outstanding.
+
+        :arg methods: Method objects.
+        :arg ends: End positions of the requests in the send buffer.
+
+        :returns: Return values of the methods.
+        """
+        starts = [0] + ends[:-1]
+        results = []
+        sent = 0
+
+        for done, method in enumerate(methods):
+            last = max(sent, done + 1)
+            while (last < len(ends) and
+                    ends[last] - starts[done] <= self._window):
+                last += 1
+            if last > sent:
+                self._send(ends[last - 1], starts[sent])
+                sent = last
+            results.append(self._decode(method))
+
+        return results
+
+    def _drain(self: object) -> None:
+        """Read the acknowledgements of void methods that were sent without
+        waiting."""
+        if not self._pending_acks:
+            return
+
+        count = self._pending_acks
+        self._pending_acks = 0
+        self._pending_size = 0
+        acks = self._connection.read(count)
+        if len(acks) < count:
+            raise TimeoutError('acknowledgement expected')
+        if any(acks):
+            self._desynchronised = True
+            raise ValueError('invalid acknowledgement')
+
+    def _decode(self: object, method: dict) -> Any:
+        """Read the response of a method.
+
+        :arg method: Method object.
+
+        :returns: Return value of the method.
+        """
+        # Fixed size types, use one read and one unpack call.
+        codec = self._codec(method)
+        if codec:
+            return codec.decode(read_into(
+                self._connection, self._receive_buffer, codec.response_size))
+
+        # Read return value (if any).
+        if method['return']['fmt']:
+            return self._read(method['return']['fmt'])
+
+        # A `void` method writes a 0 for synchronisation purposes.
+        self._read('B')
+        return None
+
     def _read_byte_string(self: object) -> bytes:
         return read_byte_string(self._connection)
 
@@ -102,33 +381,291 @@ class _Interface(object):
         """
         return read(
             self._connection, self.device['endianness'], self.device['size_t'],
-            obj_type)
+            obj_type, self._receive_buffer)
 
-    def _get_methods(self: object) -> None:
-        """Get remote procedure call methods."""
-        self._select(_list_req)
-
-        _assert_protocol(self._read_byte_string().decode())
-        self.device['protocol'] = _protocol
+    def _read_listing(self: object) -> tuple:
+        """Read the response to a method list request after the protocol
+        header.
 
+        :returns: Version, endianness, size_t and method definitions.
+        """
         version = tuple(self._read('B') for _ in range(3))
         _assert_version(version)
-        self.device['version'] = version
 
-        self.device['endianness'], self.device['size_t'] = (
-            chr(c) for c in self._read_byte_string())
+        endianness, size_t = (chr(c) for c in self._read_byte_string())
+
+        return version, endianness, size_t, read_byte_strings(
+            self._connection)
+
+    def _probe(self: object) -> tuple:
+        """Request the method list without parsing the method definitions.
+
+        :returns: Version, endianness, size_t and method definitions.
+        """
+        self._select(_list_req)
+        _assert_protocol(self._read_byte_string().decode())
+
+        return self._read_listing()
+
+    def _checksum(self: object) -> int:
+        """Request the method list and compute its checksum.
+
+        :returns: Checksum.
+        """
+        version, endianness, size_t, lines = self._probe()
+
+        return crc32(b'\0'.join(lines), crc32(
+            bytes(version) + (endianness + size_t).encode('utf-8')))
+
+    def _quick_probe(self: object) -> tuple:
+        """Request the method list from a device that may not be ready.
 
-        for index, line in enumerate(
-                until(lambda x: x == b'', self._read_byte_string)):
+        :returns: Version, endianness, size_t and method definitions or None
+            if the device did not respond in time.
+        """
+        timeout = self._set_timeout(_probe_timeout)
+        try:
+            return self._probe()
+        except (TimeoutError, ValueError):
+            return None
+        finally:
+            self._set_timeout(timeout)
+
+    def _start(self: object) -> tuple:
+        """Wait for the device to start, unless it was not reset and it
+        responds right away.
+
+        :returns: Version, endianness, size_t and method definitions if the
+            device was queried, None otherwise.
+        """
+        listing = None
+        if not self._reset:
+            listing = self._quick_probe()
+        if not listing:
+            sleep(self._wait)
+            if not self._reset:
+                self._connection.reset_input_buffer()
+
+        if self._autobaud:
+            self._negotiate_baudrate()
+            return None
+        return listing
+
+    def _resync(self: object) -> None:
+        """Discard all pending data and wait for the device to respond to a
+        method list request.
+
+        Every attempt sends a new request. Requests of earlier attempts may
+        still be answered, these responses are discarded as well. When no
+        timeout is set, every read is limited to `_probe_timeout`.
+        """
+        self._desynchronised = True
+        self._pending_acks = 0
+        self._pending_size = 0
+
+        header = _protocol.encode('utf-8') + b'\0'
+        timeout = self._connection.timeout
+        if timeout is None:
+            self._set_timeout(_probe_timeout)
+        try:
+            self._connection.reset_input_buffer()
+            self._select(_list_req)
+            self._list_requests += 1
+
+            received = False
+            while self._list_requests:
+                if not self._connection.read_until(header).endswith(header):
+                    if not received:
+                        raise TimeoutError('no protocol header received')
+                    break
+                self._read_listing()
+                self._list_requests -= 1
+                if not received:
+                    received = True
+                    self._set_timeout(_probe_timeout)
+            self._list_requests = 0
+        finally:
+            self._set_timeout(timeout)
+        self._desynchronised = False
+
+    def _set_timeout(self: object, timeout: float) -> float:
+        """Change the timeout of the connection.
+
+        :arg timeout: New timeout.
+
+        :returns: Old timeout.
+        """
+        old_timeout = self._connection.timeout
+        if timeout != old_timeout:
+            self._connection.timeout = timeout
+        return old_timeout
+
+    def _transact(
+            self: object, methods: list, calls: list, timeout: float) -> list:
+        """Send requests and read the responses, resynchronise when the
+        device does not respond in time.
+
+        :arg methods: Method objects.
+        :arg calls: List of (name, parameters) tuples.
+        :arg timeout: Time in seconds to wait for the responses (None for
+            the interface default).
+
+        :returns: Return values of the methods.
+        """
+        if timeout is None:
+            timeout = self._timeout
+        connection = self._connection
+        if timeout is not None:
+            self._connection = _Deadline(connection, timeout)
+        try:
+            if self._desynchronised:
+                self._resync()
+            self._drain()
+
+            size = 0
+            ends = []
+            for method, (_, args) in zip(methods, calls):
+                size = self._encode(method, args, size)
+                ends.append(size)
+            if self._window:
+                return self._exchange(methods, ends)
+            self._send(size)
+
+            return [self._decode(method) for method in methods]
+        except TimeoutError as error:
+            self._recover(error)
+        finally:
+            if self._connection is not connection:
+                self._connection = connection
+                connection.timeout = self._timeout
+
+    def _recover(self: object, error: TimeoutError) -> None:
+        """Resynchronise after a timeout and report the failed call.
+
+        :arg error: Original error.
+        """
+        cancelled, self._cancelled = self._cancelled, False
+        try:
+            self._resync()
+        except (IOError, ValueError):
+            pass
+
+        if cancelled:
+            raise CallTimeoutError('call cancelled') from error
+        raise CallTimeoutError(
+            'no response from device: {}'.format(error)) from error
+
+    def cancel(self: object) -> None:
+        """Cancel the call in progress, e.g., from an other thread."""
+        if not hasattr(self._connection, 'cancel_read'):
+            raise NotImplementedError('cancellation is not supported')
+        self._cancelled = True
+        self._connection.cancel_read()
+
+    def _reconnect(self: object, error: IOError) -> None:
+        """Wait for a disconnected device to come back, reconnect and check
+        that the device still has the same interface.
+
+        :arg error: Original error.
+        """
+        try:
+            self._close()
+        except IOError:
+            pass
+
+        deadline = monotonic() + self._reconnect_timeout
+        while True:
+            try:
+                self._open()
+                break
+            except IOError:
+                if monotonic() >= deadline:
+                    raise IOError('device disconnected') from error
+                sleep(_reconnect_interval)
+
+        self._desynchronised = False
+        self._list_requests = 0
+        self._cancelled = False
+        self._pending_acks = 0
+        self._pending_size = 0
+
+        if self._fingerprint is None:
+            self._fingerprint = device_fingerprint(self.device)
+        _, endianness, size_t, lines = self._start() or self._probe()
+        if fingerprint(endianness, size_t, lines) != self._fingerprint:
+            self._close()
+            raise ValueError('device interface changed')
+
+    def _reconnect_call(self: object, error: IOError, sent: bool) -> None:
+        """Reconnect after a call failed because the connection broke.
+
+        A call is only made again when its request was not written, unless
+        retrying is enabled, the device may have executed it otherwise.
+
+        :arg error: Original error.
+        :arg sent: Whether the request was written.
+        """
+        if isinstance(error, TimeoutError) or not self._reconnect_timeout:
+            raise error
+        self._reconnect(error)
+        if sent and not self._retry:
+            raise IOError(
+                'device disconnected after the request was sent') from error
+
+    def _negotiate_baudrate(self: object) -> None:
+        """Find and use the highest baud rate that works reliably."""
+        def _set_baudrate(baudrate: int) -> None:
+            self._connection.baudrate = baudrate
+            self._connection.reset_input_buffer()
+
+        timeout = self._connection.timeout
+        self._connection.timeout = _probe_timeout
+        try:
+            negotiate(self._connection.port, _set_baudrate, self._checksum)
+        finally:
+            self._connection.timeout = timeout
+
+    def _get_methods(self: object, listing: tuple=None) -> None:
+        """Get remote procedure call methods.
+
+        :arg listing: Method list of the device, if it was already queried.
+        """
+        version, endianness, size_t, lines = listing or self._probe()
+        self.device['protocol'] = _protocol
+        self.device['version'] = version
+        self.device['endianness'] = endianness
+        self.device['size_t'] = size_t
+        self._fingerprint = fingerprint(endianness, size_t, lines)
+
+        if self._lazy:
+            self.device['methods'] = MethodIndex(lines)
+            return
+        for index, line in enumerate(lines):
             method = parse_line(index, line)
             self.device['methods'][method['name']] = method
 
-    def _load(self: object, handle: TextIO=None) -> None:
+    def _codec(self: object, method: dict) -> Codec:
+        """Get the codec for a method with fixed size types.
+
+        :arg method: Method object.
+
+        :returns: Codec or None.
+        """
+        if method['name'] not in self._codecs:
+            self._codecs[method['name']] = Codec.compile(
+                self.device['endianness'], method)
+        return self._codecs[method['name']]
+
+    def _load(self: object, handle: Union[TextIO, dict]=None) -> None:
         """Load the interface definition from a file.
 
-        :arg handle: Open file handle.
+        :arg handle: Open file handle or interface definition.
         """
-        self.device = load(handle, Loader=FullLoader)
+        if isinstance(handle, dict):
+            self.device = dict(handle, methods=dict(handle['methods']))
+        else:
+            self.device = load(handle, Loader=FullLoader)
+        self._fingerprint = None
         _assert_protocol(self.device.get('protocol', ''))
         _assert_version(self.device.get('version', (0, 0, 0)))
 
@@ -141,29 +678,34 @@ class _Interface(object):
 
         :arg handle: Open file handle.
         """
-        sleep(self._wait)
+        listing = self._start()
 
         if handle:
             self._load(handle)
         else:
-            self._get_methods()
-        for method in self.device['methods'].values():
-            setattr(
-                self, method['name'], MethodType(make_function(method), self))
+            self._get_methods(listing)
+        if not self._lazy:
+            for method in self.device['methods'].values():
+                setattr(
+                    self, method['name'],
+                    MethodType(make_function(method), self))
+                self._codec(method)
 
     def close(self: object) -> None:
         """Disconnect from device."""
         for method in self.device['methods']:
-            delattr(self, method)
+            if method in self.__dict__:
+                delattr(self, method)
         self.device['methods'].clear()
+        self._codecs.clear()
 
-    def call_method(self: object, name: str, *args: Any) -> Any:
-        """Execute a method.
+    def _method(self: object, name: str, args: tuple) -> dict:
+        """Look up a method and check its parameters.
 
         :arg name: Method name.
         :arg args: Method parameters.
 
-        :returns: Return value of the method.
+        :returns: Method object.
         """
         if name not in self.device['methods']:
             raise ValueError('invalid method name: {}'.format(name))
@@ -175,28 +717,79 @@ class _Interface(object):
                 '{} expected {} arguments, got {}'.format(
                     name, len(parameters), len(args)))
 
-        # Call the method.
-        self._select(method['index'])
+        return method
 
-        # Provide parameters (if any).
-        if method['parameters']:
-            for index, parameter in enumerate(method['parameters']):
-                self._write(parameter['fmt'], args[index])
+    @_reconnecting
+    def call_method(
+            self: object, name: str, *args: Any, timeout: float=None) -> Any:
+        """Execute a method.
 
-        # Read return value (if any).
-        if method['return']['fmt']:
-            return self._read(method['return']['fmt'])
+        :arg name: Method name.
+        :arg args: Method parameters.
+        :arg timeout: Time in seconds to wait for the response (None for
+            the interface default).
 
-        # A `void` method writes a 0 for synchronisation purposes.
-        self._read('B')
-        return None
+        :returns: Return value of the method.
+        """
+        method = self._method(name, args)
+
+        # Without a timeout, or when no response is read, the call does not
+        # need a deadline.
+        if timeout is None and not self._desynchronised and (
+                self._timeout is None or (
+                    self._nowait and not method['return']['fmt'])):
+            try:
+                size = self._encode(method, args)
+                if self._nowait and not method['return']['fmt']:
+                    if self._window and (
+                            self._pending_size + size > self._window):
+                        self._drain()
+                    self._send(size)
+                    self._pending_acks += 1
+                    self._pending_size += size
+                    return None
+
+                if self._window:
+                    self._drain()
+                self._send(size)
+                self._drain()
+                return self._decode(method)
+            except TimeoutError as error:
+                self._recover(error)
+
+        return self._transact([method], [(name, args)], timeout)[0]
+
+    @_reconnecting
+    def call_methods(self: object, calls: list, timeout: float=None) -> list:
+        """Execute a number of methods, all requests are sent in one write
+        before the responses are read.
+
+        :arg calls: List of (name, parameters) tuples.
+        :arg timeout: Time in seconds to wait for the responses (None for
+            the interface default).
+
+        :returns: Return values of the methods.
+        """
+        return self._transact(
+            [self._method(name, args) for name, args in calls], calls,
+            timeout)
+
+    def sync(self: object) -> None:
+        """Wait for the acknowledgements of void methods that were sent
+        without waiting."""
+        try:
+            self._drain()
+        except TimeoutError as error:
+            self._recover(error)
 
     def save(self: object, handle: TextIO) -> None:
         """Save the interface definition to a file.
 
         :arg handle: Open file handle.
         """
-        dump(self.device, handle, width=76, default_flow_style=False)
+        dump(
+            dict(self.device, methods=dict(self.device['methods'])), handle,
+            width=76, default_flow_style=False)
 
 
 class SerialInterface(_Interface):
@@ -235,8 +828,13 @@ class SocketInterface(_Interface):
     def is_open(self: object) -> bool:
         return len(self.device['methods']) > 0
 
+    def _negotiate_baudrate(self: object) -> None:
+        """Baud rates do not apply to sockets."""
+        pass
+
     open = _auto_open(_Interface.open)
     call_method = _auto_open(_Interface.call_method)
+    call_methods = _auto_open(_Interface.call_methods)
 
 
 class Interface(object):
@@ -247,3 +845,139 @@ class Interface(object):
         if device.startswith('socket'):
             return SocketInterface(device, *args, **kwargs)
         return SerialInterface(device, *args, **kwargs)
+
+    @staticmethod
+    def shared(
+            device: str, idle_timeout: float=0, **kwargs: Any) -> object:
+        """Get a shared interface, the connection is made by the first user.
+
+        :arg device: Device name.
+        :arg idle_timeout: Time in seconds before the connection is closed
+            after the last user released it.
+        :arg kwargs: Interface constructor parameters, only used when the
+            connection is made.
+
+        :returns: Shared interface.
+        """
+        with _shared_lock:
+            interface = _shared.get(device)
+            connect = interface is None
+            if connect:
+                interface = SharedInterface(device, None, idle_timeout)
+                _shared[device] = interface
+            interface._acquire()
+
+        if connect:
+            interface._connect(**kwargs)
+        else:
+            interface._wait()
+
+        return interface
+
+
+class SharedInterface(object):
+    """Thread safe interface with reference counting.
+
+    Every call is made while holding a lock. The connection is closed when
+    the last user releases the interface, or after {idle_timeout} seconds if
+    no new user comes along.
+    """
+    def __init__(
+            self: object, url: str, interface: object,
+            idle_timeout: float) -> None:
+        """
+        :arg url: Device name.
+        :arg interface: Interface (None if the connection is not made yet).
+        :arg idle_timeout: Time in seconds before the connection is closed
+            after the last user released it.
+        """
+        self.url = url
+        self.interface = interface
+        self.idle_timeout = idle_timeout
+        self.users = 0
+
+        self._lock = RLock()
+        self._timer = None
+        self._ready = Event()
+        self._error = None
+        if interface is not None:
+            self._ready.set()
+
+    def __getattr__(self: object, name: str) -> Any:
+        """Make a locking wrapper for a member function when it is first
+        used."""
+        attribute = getattr(self.interface, name)
+        if not callable(attribute) or name == 'cancel':
+            return attribute
+
+        @wraps(attribute)
+        def _locked(*args: Any, **kwargs: Any) -> Any:
+            with self._lock:
+                return attribute(*args, **kwargs)
+
+        setattr(self, name, _locked)
+
+        return _locked
+
+    def __enter__(self: object) -> object:
+        return self
+
+    def __exit__(
+            self: object, exc_type: None, exc_val: None, exc_tb: None) -> None:
+        self.release()
+
+    def _acquire(self: object) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self.users += 1
+
+    def _connect(self: object, **kwargs: Any) -> None:
+        """Make the connection, other users wait until it is made.
+
+        :arg kwargs: Interface constructor parameters.
+        """
+        try:
+            self.interface = Interface(self.url, **kwargs)
+        except BaseException as error:
+            self._error = error
+            with _shared_lock:
+                self.users = 0
+                if _shared.get(self.url) is self:
+                    del _shared[self.url]
+            raise
+        finally:
+            self._ready.set()
+
+    def _wait(self: object) -> None:
+        """Wait until the connection is made by the first user."""
+        self._ready.wait()
+        if self.interface is None:
+            raise IOError('connection failed') from self._error
+
+    def _expire(self: object) -> None:
+        """Close the connection if the interface is not in use."""
+        with _shared_lock:
+            if self.users or _shared.get(self.url) is not self:
+                return
+            del _shared[self.url]
+        with self._lock:
+            self.interface.close()
+
+    def release(self: object) -> None:
+        """Stop using the interface."""
+        with _shared_lock:
+            if not self.users:
+                raise ValueError('interface not in use')
+            self.users -= 1
+            if self.users:
+                return
+
+            if self.idle_timeout:
+                self._timer = Timer(self.idle_timeout, self._expire)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self._expire()
+
+    close = release
@@ -0,0 +1,207 @@
+from mmap import ACCESS_READ, mmap
+from os import makedirs
+from os.path import exists, join
+from struct import Struct, calcsize
+from time import time
+from typing import Any, Iterator
+
+from yaml import dump, safe_load
+
+from .codec import _flatten
+from .protocol import _parse_type, _type_str, type_info
+
+
+_count = Struct('=Q')
+_native = {'l': 'iq', 'L': 'IQ'}
+
+
+def _view_fmt(fmt: str) -> str:
+    """Native format of a column for `memoryview.cast`, columns are stored
+    with standard sizes.
+
+    :arg fmt: Struct format.
+
+    :returns: Native format with the same size.
+    """
+    size = calcsize('=' + fmt)
+    for native in fmt + _native.get(fmt, ''):
+        if calcsize(native) == size:
+            return native
+    raise ValueError('no native format for: {}'.format(fmt))
+
+
+def _columns(obj_type: Any, name: str='value') -> Iterator:
+    """Column names and struct formats of a fixed size type.
+
+    :arg obj_type: Type object.
+    :arg name: Column name prefix.
+
+    :returns: Iterator over (name, format) tuples.
+    """
+    if isinstance(obj_type, tuple):
+        for index, item in enumerate(obj_type):
+            yield from _columns(item, '{}.{}'.format(name, index))
+    else:
+        yield name, obj_type
+
+
+def _map(path: str, size: int, writable: bool) -> mmap:
+    """Memory map a file.
+
+    :arg path: Path to the file.
+    :arg size: File size, used when the file is created.
+    :arg writable: Open the file for writing.
+
+    :returns: Memory map.
+    """
+    if not writable:
+        with open(path, 'rb') as handle:
+            return mmap(handle.fileno(), 0, access=ACCESS_READ)
+
+    with open(path, 'a+b') as handle:
+        if handle.tell() != size:
+            handle.truncate(size)
+        return mmap(handle.fileno(), size)
+
+
+class _Columns(object):
+    """Memory mapped column files."""
+    def __init__(self: object, path: str, writable: bool) -> None:
+        """
+        :arg path: Directory.
+        :arg writable: Open the files for writing.
+        """
+        with open(join(path, 'columns.yml')) as handle:
+            definition = safe_load(handle)
+
+        self.capacity = definition['capacity']
+        self.obj_type = _parse_type(definition['type'].encode('utf-8'))
+        self.columns = [column['name'] for column in definition['columns']]
+        self._fmts = [column['fmt'] for column in definition['columns']]
+        self._structs = [Struct('=' + fmt) for fmt in self._fmts]
+        self._views = [_view_fmt(fmt) for fmt in self._fmts]
+
+        self._count = _map(join(path, 'count'), _count.size, writable)
+        self._maps = [
+            _map(
+                join(path, '{}.col'.format(name)),
+                2 * self.capacity * packer.size, writable)
+            for name, packer in zip(self.columns, self._structs)]
+
+    def __enter__(self: object) -> object:
+        return self
+
+    def __exit__(
+            self: object, exc_type: None, exc_val: None, exc_tb: None) -> None:
+        self.close()
+
+    @property
+    def count(self: object) -> int:
+        """Number of rows written since the sink was created."""
+        return _count.unpack_from(self._count)[0]
+
+    def close(self: object) -> None:
+        """Close the column files, all views must be released first."""
+        for column in self._maps + [self._count]:
+            column.close()
+
+
+class Sink(_Columns):
+    """Append-only, memory mapped columnar storage for method results.
+
+    A directory holds one file per column (`time` and one or more value
+    columns). Every column is a ring buffer that holds the last {capacity}
+    rows, each row is stored twice so that any window of at most {capacity}
+    rows is contiguous.
+    """
+    def __init__(
+            self: object, path: str, obj_type: Any=None,
+            capacity: int=65536) -> None:
+        """
+        :arg path: Directory, created if it does not exist.
+        :arg obj_type: Return type object of the method, not needed when
+            the sink already exists.
+        :arg capacity: Number of rows kept.
+        """
+        if not exists(join(path, 'columns.yml')):
+            fmt = type_info(_type_str(obj_type).encode('utf-8')).fmt
+            if not fmt:
+                raise ValueError('only fixed size types can be stored')
+            if capacity < 1:
+                raise ValueError('capacity must be positive')
+
+            makedirs(path, exist_ok=True)
+            with open(join(path, 'columns.yml'), 'w') as handle:
+                dump({
+                    'capacity': capacity,
+                    'type': _type_str(obj_type),
+                    'columns': [{'name': 'time', 'fmt': 'd'}] + [
+                        {'name': name, 'fmt': fmt}
+                        for name, fmt in _columns(obj_type)]}, handle)
+
+        super().__init__(path, True)
+
+    @classmethod
+    def for_method(
+            cls: object, path: str, method: dict, capacity: int=65536
+            ) -> object:
+        """Make a sink for the results of a method.
+
+        :arg path: Directory.
+        :arg method: Method object.
+        :arg capacity: Number of rows kept.
+
+        :returns: Sink.
+        """
+        return cls(path, method['return']['fmt'], capacity)
+
+    def append(self: object, result: Any, timestamp: float=None) -> None:
+        """Append a method result.
+
+        :arg result: Method result.
+        :arg timestamp: Time stamp, defaults to the current time.
+        """
+        count = self.count
+        row = count % self.capacity
+        values = [time() if timestamp is None else timestamp]
+        values.extend(_flatten(self.obj_type, result))
+
+        for column, packer, value in zip(self._maps, self._structs, values):
+            packer.pack_into(column, row * packer.size, value)
+            packer.pack_into(
+                column, (row + self.capacity) * packer.size, value)
+        _count.pack_into(self._count, 0, count + 1)
+
+
+class Reader(_Columns):
+    """Read access to a sink, possibly while it is being written to by an
+    other process."""
+    def __init__(self: object, path: str) -> None:
+        """
+        :arg path: Directory.
+        """
+        super().__init__(path, False)
+
+    def last(self: object, name: str, rows: int=0) -> memoryview:
+        """Get the most recent values of a column without copying.
+
+        The result can be converted to a NumPy array without copying with
+        `numpy.frombuffer`. Values that are older than {capacity} rows may
+        be overwritten by a concurrent writer.
+
+        :arg name: Column name.
+        :arg rows: Number of rows (0 for all available rows).
+
+        :returns: Typed view of the column.
+        """
+        index = self.columns.index(name)
+        count = self.count
+        available = min(count, self.capacity)
+        if not 0 <= rows <= available:
+            raise ValueError(
+                'only {} rows are available'.format(available))
+        rows = rows or available
+
+        start = (count - rows) % self.capacity
+        return memoryview(self._maps[index]).cast(
+            self._views[index])[start:start + rows]
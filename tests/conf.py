@@ -1,3 +1,4 @@
+from simple_rpc.sim import Device
 from simple_rpc.simple_rpc import _version
 
 
@@ -28,3 +29,20 @@ version: !!python/tuple
 - 0
 - 0
 """.format(''.join(map('- {}\n'.format, _version)))
+
+
+def _device(*methods: tuple) -> Device:
+    """Simulated device with a `ping` method and additional methods.
+
+    :arg methods: (function, signature, documentation) tuples.
+
+    :returns: Simulated device.
+    """
+    device = Device()
+    device.add_method(
+        lambda x: x, 'B: B',
+        'ping: Echo a value. @data: Value. @return: Value of data.')
+    for method in methods:
+        device.add_method(*method)
+
+    return device
@@ -0,0 +1,112 @@
+from os import listdir
+from os.path import dirname
+
+from pytest import fixture
+
+from simple_rpc import Interface, baudrate
+from simple_rpc.baudrate import load_cache, negotiate, save_cache
+from simple_rpc.sim import Device, LocalServer
+
+
+@fixture(autouse=True)
+def cache(tmp_path: object, monkeypatch: object) -> None:
+    monkeypatch.setattr(
+        baudrate, 'cache_path', str(tmp_path / 'cache' / 'baudrates.yml'))
+
+
+def _checksum(rates: list, working: tuple) -> callable:
+    def _checksum_() -> int:
+        if rates[-1] not in working:
+            raise IOError('timeout')
+        return 1
+
+    return _checksum_
+
+
+def test_cache() -> None:
+    assert load_cache() == {}
+    save_cache('a', 9600)
+    save_cache('b', 115200)
+    assert load_cache() == {'a': 9600, 'b': 115200}
+    save_cache('a', 0)
+    assert load_cache() == {'b': 115200}
+
+
+def test_cache_atomic(monkeypatch: object) -> None:
+    save_cache('a', 9600)
+
+    def _dump(data: dict, handle: object) -> None:
+        handle.write('a: ')
+        raise IOError('disk full')
+
+    monkeypatch.setattr(baudrate, 'dump', _dump)
+    try:
+        save_cache('b', 115200)
+    except IOError:
+        pass
+    else:
+        assert False
+    assert load_cache() == {'a': 9600}
+    assert listdir(dirname(baudrate.cache_path)) == ['baudrates.yml']
+
+
+def test_negotiate() -> None:
+    rates = []
+
+    assert negotiate(
+        'a', rates.append, _checksum(rates, (9600, 19200)),
+        (9600, 19200, 38400)) == 19200
+    assert rates == [38400, 19200]
+    assert load_cache() == {'a': 19200}
+
+
+def test_negotiate_cached() -> None:
+    rates = []
+    save_cache('a', 9600)
+
+    assert negotiate(
+        'a', rates.append, _checksum(rates, (9600, 19200)),
+        (9600, 19200, 38400)) == 9600
+    assert rates == [9600]
+
+
+def test_negotiate_cached_fail() -> None:
+    rates = []
+    save_cache('a', 38400)
+
+    assert negotiate(
+        'a', rates.append, _checksum(rates, (9600, )),
+        (9600, 19200, 38400)) == 9600
+    assert rates == [38400, 19200, 9600]
+    assert load_cache() == {'a': 9600}
+
+
+def test_negotiate_unstable() -> None:
+    rates = []
+    checksums = iter([1, 2, 3, 4, 4])
+
+    assert negotiate(
+        'a', rates.append, lambda: next(checksums), (9600, 19200)) == 9600
+    assert rates == [19200, 9600]
+
+
+def test_negotiate_fail() -> None:
+    rates = []
+
+    try:
+        negotiate('a', rates.append, _checksum(rates, ()), (9600, 19200))
+    except IOError as error:
+        assert str(error) == 'no working baud rate found'
+    else:
+        assert False
+
+
+def test_interface() -> None:
+    device = Device()
+    device.add_method(lambda x: x, 'B: B', 'ping: Echo a value.')
+
+    with LocalServer(device, baudrates=(115200, 9600)) as server:
+        with Interface(server.url, 0, 0) as interface:
+            assert interface._connection.baudrate == 115200
+            assert interface.ping(3) == 3
+        assert load_cache() == {server.url: 115200}
@@ -1,12 +1,22 @@
+from importlib.util import module_from_spec, spec_from_file_location
 from io import StringIO
+from json import loads
 
 from pytest import mark
 from yaml import FullLoader, load
 
-from simple_rpc.cli import _describe_method, rpc_call, rpc_list
-from simple_rpc.extras import json_utf8_decode, json_utf8_encode
+from simple_rpc.cli import (
+    _describe_method, _parse_args, rpc_call, rpc_codegen, rpc_list,
+    rpc_profile, rpc_scan, rpc_watch)
+from simple_rpc.extras import (
+    json_decoder, json_encoder, json_utf8_decode, json_utf8_encode)
+from simple_rpc.sim import LocalServer
 
-from .conf import _devices, _interface
+from .conf import _device, _devices, _interface
+
+
+_methods = (
+    (lambda x: x + b'!', 's: s', 'shout: Shout.'), )
 
 
 def test_json_utf8_encode() -> None:
@@ -19,6 +29,36 @@ def test_json_utf8_decode() -> None:
     assert json_utf8_decode((b'a', (b'b', 10))) == ['a', ['b', 10]]
 
 
+def test_json_decoder_numeric() -> None:
+    obj = [1, 2, 3]
+
+    assert json_decoder(['h'])(obj) is obj
+    assert json_decoder('h')(1) == 1
+
+
+def test_json_decoder_string() -> None:
+    assert json_decoder('s')(b'a') == 'a'
+    assert json_decoder(['s'])([b'a', b'b']) == ['a', 'b']
+    assert json_decoder(['h', 's'])([1, b'a', 2, b'b']) == [1, 'a', 2, 'b']
+    assert json_decoder(('h', ('s', )))((1, (b'a', ))) == [1, ['a']]
+
+
+def test_json_encoder() -> None:
+    obj = [1.0, 2.0]
+
+    assert json_encoder(['f'])(obj) is obj
+    assert json_encoder(['s'])(['a', 'b']) == [b'a', b'b']
+    assert json_encoder(('h', ('s', )))([1, ['a']]) == [1, [b'a']]
+
+
+def test_parse_args() -> None:
+    method = {'parameters': [
+        {'fmt': 'h'}, {'fmt': 's'}, {'fmt': 's'}, {'fmt': ('h', 's')}]}
+
+    assert _parse_args(method, ['10', '"a"', '10', '[1, "b"]']) == [
+        10, b'a', b'10', [1, b'b']]
+
+
 def test_describe_method() -> None:
     assert (_describe_method({
         'name': 'test',
@@ -81,3 +121,91 @@ def test_rpc_call_load_() -> None:
         assert str(error) == 'invalid method name: inc'
     else:
         assert False
+
+
+def test_rpc_watch() -> None:
+    handle = StringIO()
+
+    with LocalServer(_device(*_methods)) as server:
+        rpc_watch(handle, server.url, 9600, 0, None, 'shout', ['"a"'], 100, 3)
+
+    lines = list(map(loads, handle.getvalue().splitlines()))
+    assert len(lines) == 3
+    assert lines[0]['result'] == 'a!'
+    assert lines[0]['missed'] == 0
+    assert lines[0]['time'] < lines[1]['time'] < lines[2]['time']
+
+
+def test_rpc_watch_frequency() -> None:
+    try:
+        rpc_watch(StringIO(), '', 9600, 0, None, 'ping', [], 0, 1)
+    except ValueError as error:
+        assert str(error) == 'frequency must be positive'
+    else:
+        assert False
+
+
+def test_rpc_codegen(tmp_path: object) -> None:
+    path = tmp_path / 'client.py'
+
+    with LocalServer(_device(*_methods)) as server:
+        rpc_codegen(server.url, 9600, 0, str(path), 'Client')
+
+        spec = spec_from_file_location('client', str(path))
+        module = module_from_spec(spec)
+        spec.loader.exec_module(module)
+        with module.Client(server.url, wait=0) as interface:
+            assert interface.shout(b'a') == b'a!'
+
+    assert 'def shout(self, arg0: bytes) -> bytes: ...' in (
+        tmp_path / 'client.pyi').read_text()
+
+
+def test_rpc_codegen_load(tmp_path: object) -> None:
+    path = tmp_path / 'client.py'
+    (tmp_path / 'interface.yml').write_text(_interface)
+
+    rpc_codegen(str(tmp_path / 'interface.yml'), 9600, 0, str(path), 'Test')
+    assert 'class Test(GeneratedInterface):' in path.read_text()
+
+
+def test_rpc_profile() -> None:
+    handle = StringIO()
+
+    with LocalServer(_device(*_methods)) as server:
+        rpc_profile(handle, server.url, 9600, 0, None, 'ping', ['10'], 5)
+
+    lines = handle.getvalue().splitlines()
+    assert lines[0] == 'calls: 5'
+    assert lines[2] == 'size (bytes): request 2, response 1'
+
+
+def test_rpc_call_sim() -> None:
+    handle = StringIO()
+
+    with LocalServer(_device(*_methods)) as server:
+        rpc_call(handle, server.url, 9600, 0, None, 'shout', ['10'])
+
+    assert handle.getvalue() == '"10!"\n'
+
+
+def test_rpc_scan(tmp_path: object) -> None:
+    handle = StringIO()
+
+    with LocalServer(_device(*_methods), name='scan') as server:
+        rpc_scan(handle, [server.url], 9600, 0, 1.0, str(tmp_path))
+
+    assert handle.getvalue() == (
+        'sim://scan: simpleRPC 4.0.0, endianness <, size_t H, 2 methods\n')
+    with open(tmp_path / 'sim_scan.yml') as definition:
+        assert list(load(definition, Loader=FullLoader)['methods']) == [
+            'ping', 'shout']
+
+
+def test_rpc_call_no_reset() -> None:
+    handle = StringIO()
+
+    with LocalServer(_device(*_methods)) as server:
+        rpc_call(handle, server.url, 9600, 5, None, 'ping', ['3'], False)
+
+    assert handle.getvalue() == '3\n'
@@ -0,0 +1,87 @@
+from time import perf_counter, sleep
+
+from simple_rpc.clock import ClockSync
+from simple_rpc.sim import LocalServer
+from simple_rpc.simple_rpc import Interface
+
+from .conf import _device
+
+
+_offset = 1000.0
+_drift = 0.01
+_wrap = 2**32 * 1e-6
+
+
+_methods = (
+    (lambda: int((perf_counter() * (1 + _drift) + _offset) * 1e6) % 2**32,
+        'L:', 'micros: Time in microseconds.'),
+    (lambda: int(perf_counter() * 1e3) % 2**8, 'B:',
+        'short_millis: Time in milliseconds.'),
+    (lambda: 21.5, 'f:', 'temperature: Temperature.'))
+
+
+def _expected(time: float) -> float:
+    return time * (1 + _drift) + _offset
+
+
+def test_sync() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            clock = ClockSync(interface, 'micros', 1e-6)
+            for _ in range(4):
+                clock.sync()
+                sleep(0.1)
+
+            assert abs(clock.drift - _drift) < 0.003
+            now = perf_counter()
+            error = (clock.device_time(now) - _expected(now)) % _wrap
+            assert min(error, _wrap - error) < 0.002
+            assert abs(clock.host_time(clock.device_time(now)) - now) < 1e-9
+
+
+def test_call_method() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            clock = ClockSync(interface, 'micros', 1e-6)
+            start = perf_counter()
+            stamped = clock.call_method('ping', 3)
+            assert stamped.result == 3
+            assert start < stamped.time < perf_counter()
+            assert clock.device_time(stamped.time) == stamped.device_time
+
+
+def test_wrap() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            clock = ClockSync(interface, 'short_millis', samples=1)
+            times = []
+            for _ in range(5):
+                clock.sync()
+                times.append(clock._ticks)
+                sleep(0.1)
+
+    for first, second in zip(times, times[1:]):
+        assert 100 <= second - first < 200
+
+
+def test_not_synchronised() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            clock = ClockSync(interface, 'micros', 1e-6)
+            try:
+                clock.device_time(0)
+            except ValueError as error:
+                assert str(error) == 'clock not synchronised'
+            else:
+                assert False
+
+
+def test_invalid_method() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            try:
+                ClockSync(interface, 'temperature')
+            except ValueError as error:
+                assert str(error) == 'not a clock method: temperature'
+            else:
+                assert False
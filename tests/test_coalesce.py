@@ -0,0 +1,158 @@
+from time import sleep
+
+from simple_rpc.coalesce import WriteBehind
+from simple_rpc.sim import Device, LocalServer
+from simple_rpc.simple_rpc import Interface
+
+from .conf import _device
+
+
+class _Leds(object):
+    def __init__(self: object) -> None:
+        self.values = {}
+        self.calls = 0
+
+    def set_led(self: object, pin: int, value: int) -> None:
+        self.values[pin] = value
+        self.calls += 1
+
+    def get_led(self: object, pin: int) -> int:
+        return self.values.get(pin, 0)
+
+
+def _led_device(leds: _Leds) -> Device:
+    return _device(
+        (leds.set_led, ': B B', 'set_led: Set a LED.'),
+        (leds.get_led, 'B: B', 'get_led: Get a LED.'))
+
+
+def test_write_behind() -> None:
+    leds = _Leds()
+
+    with LocalServer(_led_device(leds)) as server:
+        with Interface(server.url, wait=0) as interface:
+            with WriteBehind(interface, 0) as writer:
+                writer.add('set_led', 1)
+                for value in range(100):
+                    writer.set_led(1, value)
+                    writer.set_led(2, value)
+                assert writer.ping(1) == 1
+                assert leds.calls == 0
+                assert writer.flush() == 2
+                assert writer.flush() == 0
+
+    assert leds.values == {1: 99, 2: 99}
+    assert leds.calls == 2
+
+
+def test_write_behind_getter() -> None:
+    leds = _Leds()
+
+    with LocalServer(_led_device(leds)) as server:
+        with Interface(server.url, wait=0) as interface:
+            writer = WriteBehind(interface, 0)
+            writer.add('set_led', 1, ['get_led'])
+            writer.set_led(1, 10)
+            assert writer.get_led(1) == 10
+
+
+def test_write_behind_interval() -> None:
+    leds = _Leds()
+
+    with LocalServer(_led_device(leds)) as server:
+        with Interface(server.url, wait=0) as interface:
+            writer = WriteBehind(interface, 0.05)
+            writer.add('set_led', 1)
+            writer.set_led(1, 10)
+            writer.set_led(1, 20)
+            sleep(0.2)
+            assert leds.values == {1: 20}
+            assert leds.calls == 1
+
+
+def test_write_behind_interval_error() -> None:
+    leds = _Leds()
+
+    with LocalServer(_led_device(leds)) as server:
+        with Interface(server.url, wait=0) as interface:
+            errors = [IOError('device disconnected')]
+            call_methods = interface.call_methods
+
+            def _call_methods(calls: list) -> list:
+                if errors:
+                    raise errors.pop()
+                return call_methods(calls)
+
+            interface.call_methods = _call_methods
+
+            writer = WriteBehind(interface, 0.05)
+            writer.add('set_led', 1)
+            writer.set_led(1, 10)
+            sleep(0.2)
+            assert leds.calls == 0
+            try:
+                writer.set_led(1, 20)
+            except IOError as error:
+                assert str(error) == 'device disconnected'
+            else:
+                assert False
+            assert writer.flush() == 1
+
+    assert leds.values == {1: 10}
+
+
+def test_write_behind_vector_key() -> None:
+    values = {}
+    device = _device((
+        lambda x, y: values.update({tuple(x): y}), ': [B] B',
+        'set_group: Set a group of LEDs.'))
+
+    with LocalServer(device) as server:
+        with Interface(server.url, wait=0) as interface:
+            with WriteBehind(interface, 0) as writer:
+                writer.add('set_group', 1)
+                writer.set_group([1, 2], 10)
+                writer.set_group([1, 2], 20)
+                writer.set_group([3], 30)
+                assert writer.flush() == 2
+
+    assert values == {(1, 2): 20, (3, ): 30}
+
+
+def test_write_behind_close() -> None:
+    leds = _Leds()
+
+    with LocalServer(_led_device(leds)) as server:
+        with Interface(server.url, wait=0) as interface:
+            writer = WriteBehind(interface, 0)
+            writer.add('set_led')
+            writer.set_led(1, 10)
+            writer.set_led(2, 20)
+            writer.close()
+            writer.set_led(3, 30)
+
+    assert leds.values == {2: 20, 3: 30}
+
+
+def test_write_behind_add() -> None:
+    leds = _Leds()
+
+    with LocalServer(_led_device(leds)) as server:
+        with Interface(server.url, wait=0) as interface:
+            writer = WriteBehind(interface)
+            for name, key, message in (
+                    ('missing', 0, 'invalid method name: missing'),
+                    ('ping', 0, 'not a void method: ping'),
+                    ('set_led', 3, 'key larger than number of parameters')):
+                try:
+                    writer.add(name, key)
+                except ValueError as error:
+                    assert str(error) == message
+                else:
+                    assert False
+            try:
+                writer.missing
+            except AttributeError:
+                pass
+            else:
+                assert False
@@ -0,0 +1,62 @@
+from simple_rpc.codec import Codec
+from simple_rpc.protocol import parse_line
+
+
+def _codec(line: bytes, endianness: str='<') -> Codec:
+    return Codec.compile(endianness, parse_line(3, line))
+
+
+def test_compile_variable() -> None:
+    assert _codec(b's: B;f: F.') is None
+    assert _codec(b'B: [B];f: F.') is None
+    assert _codec(b'B: B (Bs);f: F.') is None
+
+
+def _encode(codec: Codec, args: tuple) -> bytes:
+    buffer = bytearray()
+
+    return bytes(buffer[:codec.encode_into(buffer, 0, args)])
+
+
+def test_encode_basic() -> None:
+    assert _encode(_codec(b'B: B B H;f: F.'), (1, 2, 3)) == b'\3\1\2\3\0'
+
+
+def test_encode_be() -> None:
+    assert _encode(_codec(b'B: H;f: F.', '>'), (1, )) == b'\3\0\1'
+
+
+def test_encode_object() -> None:
+    assert _encode(
+        _codec(b': c ((Bc)H);f: F.'),
+        (b'a', ((1, b'b'), 2))) == b'\3a\1b\2\0'
+
+
+def test_encode_offset() -> None:
+    codec = _codec(b'B: B;f: F.')
+    buffer = bytearray(b'abc')
+
+    assert codec.request_size == 2
+    assert codec.encode_into(buffer, 1, (1, )) == 3
+    assert buffer == b'a\3\1'
+
+
+def test_decode_basic() -> None:
+    codec = _codec(b'H: B;f: F.')
+
+    assert codec.response_size == 2
+    assert codec.decode(b'\1\1') == 257
+
+
+def test_decode_void() -> None:
+    codec = _codec(b': B;f: F.')
+
+    assert codec.response_size == 1
+    assert codec.decode(b'\0') is None
+
+
+def test_decode_object() -> None:
+    codec = _codec(b'((Bc)?):;f: F.')
+
+    assert codec.response_size == 3
+    assert codec.decode(b'\1a\1') == ((1, b'a'), True)
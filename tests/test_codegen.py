@@ -0,0 +1,177 @@
+from importlib.util import module_from_spec, spec_from_file_location
+from threading import Event, Timer
+from time import sleep
+
+from simple_rpc.codegen import (
+    _flat_args, _python_type, _structure, device_fingerprint, generate,
+    generate_stub)
+from simple_rpc.protocol import fingerprint
+from simple_rpc.sim import LocalServer
+from simple_rpc.simple_rpc import CallTimeoutError, Interface
+
+from .conf import _device
+
+
+_methods = (
+    (lambda x: (x[1], (x[0], )), '(h(f)): (fh)', 'nest: Nest values.'),
+    (lambda x, y: (x[1], y), '(fs): (Bf) s', 'swap: Swap values.'),
+    (lambda x: None, ': [h]', 'drop: Drop values.'),
+    (lambda x: sleep(x) or 1, 'h: f', 'slow: Wait a while.'))
+
+
+def _client(tmp_path: object, device: dict) -> object:
+    path = tmp_path / 'client.py'
+    path.write_text(generate(device))
+
+    spec = spec_from_file_location('client', str(path))
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module.Client
+
+
+def test_flat_args() -> None:
+    assert list(_flat_args(('h', ('B', 'f')), 'a')) == [
+        'a[0]', 'a[1][0]', 'a[1][1]']
+
+
+def test_structure() -> None:
+    assert _structure(('h', ('f', )), iter(range(2))) == (
+        '(_values[0], (_values[1],))')
+
+
+def test_python_type() -> None:
+    assert _python_type('') == 'None'
+    assert _python_type(['h']) == 'List[int]'
+    assert _python_type(['h', 'f']) == 'List[Any]'
+    assert _python_type(('?', 's')) == 'Tuple[bool, bytes]'
+
+
+def test_generate(tmp_path: object) -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            Client = _client(tmp_path, interface.device)
+
+        with Client(server.url, wait=0) as client:
+            assert client.ping(3) == 3
+            assert client.ping(4.0) == 4
+            assert client.nest((1.0, 2)) == (2, (1.0, ))
+            assert client.swap((1, 2.0), b'a') == (2.0, b'a')
+            assert client.drop([1, 2]) is None
+            assert client.call_methods([('ping', (1, )), ('ping', (2, ))]) == [
+                1, 2]
+
+
+def test_generate_local_names(tmp_path: object) -> None:
+    device = _device(
+        (lambda x, y: sum(x) + y, 'H: [B] H',
+         'fill: Fill. @buffer: Data. @size: Size.'),
+        (lambda x, y: x + y, 'B: B B',
+         'add: Add. @error: Value. @request: Value.'))
+
+    with LocalServer(device) as server:
+        with Interface(server.url, wait=0) as interface:
+            Client = _client(tmp_path, interface.device)
+
+        with Client(server.url, wait=0) as client:
+            assert client.fill([1, 2, 3], 10) == 16
+            assert client.add(1, 2) == 3
+            assert client.add(1.0, 2) == 3
+
+
+def test_generate_fingerprint(tmp_path: object) -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            device = dict(
+                interface.device, methods=dict(interface.device['methods']))
+            assert device_fingerprint(device) == fingerprint(
+                *interface._probe()[1:])
+
+    other = _device(*_methods)
+    other.add_method(lambda: None, ':', 'reset: Reset.')
+    with LocalServer(other) as server:
+        try:
+            _client(tmp_path, device)(server.url, wait=0)
+        except ValueError as error:
+            assert str(error) == (
+                'device interface does not match the generated client')
+        else:
+            assert False
+
+
+def test_generate_timeout(tmp_path: object) -> None:
+    release = Event()
+    device = _device(*_methods)
+    device.add_method(
+        lambda: release.wait() and 1, 'f:', 'block: Wait until released.')
+
+    with LocalServer(device) as server:
+        with Interface(server.url, wait=0) as interface:
+            Client = _client(tmp_path, interface.device)
+
+        with Client(server.url, wait=0, timeout=0.1) as client:
+            try:
+                client.block()
+            except CallTimeoutError:
+                pass
+            else:
+                assert False
+            release.set()
+            assert client.ping(3) == 3
+
+
+def test_generate_reconnect(tmp_path: object) -> None:
+    server = LocalServer(_device(*_methods))
+    with Interface(server.url, wait=0) as interface:
+        Client = _client(tmp_path, interface.device)
+
+    servers = []
+    with Client(server.url, wait=0, reconnect=2) as client:
+        server.close()
+        Timer(0.2, lambda: servers.append(
+            LocalServer(_device(*_methods), name=server.url[6:]))).start()
+        assert client.ping(3) == 3
+        assert client.ping(4) == 4
+    servers[0].close()
+
+
+def test_generate_reconnect_sent(tmp_path: object) -> None:
+    def _crash() -> int:
+        raise OSError('power failure')
+
+    with LocalServer(_device((_crash, 'B:', 'crash: Crash.'))) as server:
+        with Interface(server.url, wait=0) as interface:
+            Client = _client(tmp_path, interface.device)
+
+        with Client(server.url, wait=0, reconnect=2) as client:
+            try:
+                client.crash()
+            except IOError as error:
+                assert str(error) == (
+                    'device disconnected after the request was sent')
+            else:
+                assert False
+            assert client.ping(3) == 3
+
+
+def test_generate_nowait(tmp_path: object) -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            Client = _client(tmp_path, interface.device)
+
+        with Client(server.url, wait=0, nowait=True) as client:
+            assert client.drop([1, 2]) is None
+            assert client._pending_acks == 1
+            assert client.ping(3) == 3
+            assert client._pending_acks == 0
+
+
+def test_generate_stub() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            stub = generate_stub(interface.device)
+
+    assert 'def ping(self, data: int) -> int: ...' in stub
+    assert (
+        'def swap(self, arg0: Tuple[int, float], arg1: bytes)'
+        ' -> Tuple[float, bytes]: ...') in stub
@@ -0,0 +1,79 @@
+from simple_rpc.extras import ConfigSync
+from simple_rpc.sim import Device, LocalServer
+from simple_rpc.simple_rpc import Interface
+
+
+class _Config(object):
+    def __init__(self: object) -> None:
+        self.config = {}
+        self.calls = []
+
+    def configure(self: object, pairs: list) -> None:
+        self.calls.append(len(pairs))
+        self.config.update(map(lambda x: (x[0].decode(), x[1]), pairs))
+
+
+def _device(config: _Config) -> Device:
+    device = Device()
+    device.add_method(
+        config.configure, ': [(si)]',
+        'configure: Set values. @pairs: Key/value pairs.')
+
+    return device
+
+
+def test_config_sync() -> None:
+    config = _Config()
+
+    with LocalServer(_device(config)) as server:
+        with Interface(server.url, wait=0) as interface:
+            sync = ConfigSync(interface, 'configure')
+
+            assert sync.push({'a': 1, 'b': 2}) == 2
+            assert sync.push({'a': 1, 'b': 3, 'c': 4}) == 2
+            assert sync.push({'a': 1, 'b': 3, 'c': 4}) == 0
+
+    assert config.config == {'a': 1, 'b': 3, 'c': 4}
+    assert config.calls == [2, 2]
+
+
+def test_config_sync_invalidate() -> None:
+    config = _Config()
+
+    with LocalServer(_device(config)) as server:
+        with Interface(server.url, wait=0) as interface:
+            sync = ConfigSync(interface, 'configure')
+
+            sync.push({'a': 1, 'b': 2})
+            sync.invalidate()
+            assert sync.push({'a': 1, 'b': 2}) == 2
+
+
+def test_config_sync_batch() -> None:
+    config = _Config()
+
+    with LocalServer(_device(config)) as server:
+        with Interface(server.url, wait=0) as interface:
+            sync = ConfigSync(interface, 'configure', 2)
+
+            assert sync.push(dict(map(lambda x: (str(x), x), range(5)))) == 5
+
+    assert config.calls == [2, 2, 1]
+
+
+def test_config_sync_failure() -> None:
+    config = _Config()
+
+    with LocalServer(_device(config)) as server:
+        with Interface(server.url, wait=0) as interface:
+            sync = ConfigSync(interface, 'configure')
+
+            sync.push({'a': 1})
+            try:
+                sync.push({'a': 2, 'b': 'x'})
+            except ValueError:
+                pass
+            else:
+                assert False
+            assert sync.state is None
+            assert sync.diff({'a': 1}) == {'a': 1}
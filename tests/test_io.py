@@ -2,7 +2,8 @@ from io import BytesIO
 from typing import Any
 
 from simple_rpc.io import (
-    _read_basic, _read_bytes_until, _write_basic, cast, read, write)
+    _read_basic, _read_bytes_until, _write_basic, cast, read, read_into,
+    read_byte_strings, write, write_into)
 
 
 def _test_invariance_basic(
@@ -45,6 +46,56 @@ def test_read_bytes_until() -> None:
     assert _read_bytes_until(stream, b'\0') == b'abcdef'
 
 
+def test_read_bytes_until_eof() -> None:
+    try:
+        _read_bytes_until(BytesIO(b'abc'), b'\0')
+    except TimeoutError as error:
+        assert str(error) == "expected b'\\x00', got b'abc'"
+    else:
+        assert False
+
+
+def test_read_into() -> None:
+    buffer = bytearray(2)
+
+    assert read_into(BytesIO(b'abcdef'), buffer, 4) is buffer
+    assert buffer == b'abcd'
+
+
+def test_read_into_no_buffer() -> None:
+    assert read_into(BytesIO(b'abcdef'), None, 4) == b'abcd'
+
+
+def test_read_into_short() -> None:
+    try:
+        read_into(BytesIO(b'ab'), bytearray(4), 4)
+    except TimeoutError as error:
+        assert str(error) == 'expected 4 bytes, got 2'
+    else:
+        assert False
+
+
+def test_read_byte_strings() -> None:
+    stream = BytesIO(b'abc\0def\0\0abc')
+
+    assert read_byte_strings(stream) == [b'abc', b'def']
+    assert stream.read() == b'abc'
+
+
+def test_read_byte_strings_empty() -> None:
+    assert read_byte_strings(BytesIO(b'\0abc')) == []
+
+
+def test_read_byte_strings_eof() -> None:
+    try:
+        read_byte_strings(BytesIO(b'abc\0def\0'))
+    except TimeoutError as error:
+        assert str(error) == (
+            "expected an empty string, got b'abc\\x00def\\x00'")
+    else:
+        assert False
+
+
 def test_basic_string() -> None:
     _test_invariance_basic(
         _read_basic, _write_basic, '<', 's', b'abcdef\0', b'abcdef')
@@ -109,3 +160,27 @@ def test_list_object_tuple() -> None:
     _test_invariance(
         read, write, '<', 'h', [('c', 'c'), 'c'], b'\2\0abcabc',
         [(b'a', b'b'), b'c', (b'a', b'b'), b'c'])
+
+
+def test_read_buffer() -> None:
+    buffer = bytearray(1)
+
+    assert read(
+        BytesIO(b'\2\0\1\0\2\0abc\0'), '<', 'h', (['h'], 's'),
+        buffer) == ([1, 2], b'abc')
+
+
+def test_write_into() -> None:
+    buffer = bytearray(1)
+
+    assert write_into(buffer, 0, '<', 'h', 'h', 1) == 2
+    assert write_into(buffer, 2, '<', 'h', ['h'], [2, 3]) == 8
+    assert write_into(buffer, 8, '<', 'h', 's', b'abc') == 12
+    assert buffer[:12] == b'\1\0\2\0\2\0\3\0abc\0'
+
+
+def test_write_into_cast() -> None:
+    buffer = bytearray()
+
+    assert write_into(buffer, 0, '<', 'h', ['h'], [1.0, 2.0]) == 6
+    assert buffer[:6] == b'\2\0\1\0\2\0'
@@ -0,0 +1,90 @@
+from threading import Event, Thread
+from time import sleep
+
+from simple_rpc.lanes import PriorityInterface
+from simple_rpc.sim import Device, LocalServer
+from simple_rpc.simple_rpc import Interface
+
+
+def _device(order: list) -> Device:
+    device = Device()
+    device.add_method(
+        lambda x: order.append(x) or x, 'B: B', 'ping: Echo a value.')
+    device.add_method(
+        lambda x: sleep(0.02) or order.append(x) or [x] * 100, '[h]: B',
+        'bulk: Get a lot of data.')
+
+    return device
+
+
+def test_priority() -> None:
+    order = []
+
+    with LocalServer(_device(order)) as server:
+        with Interface(server.url, wait=0) as interface:
+            lanes = PriorityInterface(interface)
+            started = Event()
+
+            def _bulk() -> None:
+                started.set()
+                lanes.call_methods(
+                    [('bulk', (i, )) for i in range(10)], lane='bulk')
+
+            thread = Thread(target=_bulk)
+            thread.start()
+            started.wait()
+            sleep(0.05)
+            assert lanes.call_method('ping', 100, lane='realtime') == 100
+            thread.join()
+
+    assert order.index(100) < 5
+    assert sorted(order[:order.index(100)] + order[order.index(100) + 1:]) == (
+        list(range(10)))
+
+
+def test_waiting_order() -> None:
+    order = []
+
+    with LocalServer(_device(order)) as server:
+        with Interface(server.url, wait=0) as interface:
+            lanes = PriorityInterface(interface)
+            lanes._acquire(1)
+            threads = [
+                Thread(target=lanes.call_method, args=('ping', i),
+                       kwargs={'lane': lane})
+                for i, lane in enumerate(('bulk', 'normal', 'realtime'))]
+            for thread in threads:
+                thread.start()
+                sleep(0.02)
+            lanes._release()
+            for thread in threads:
+                thread.join()
+
+    assert order == [2, 1, 0]
+
+
+def test_stats() -> None:
+    with LocalServer(_device([])) as server:
+        with Interface(server.url, wait=0) as interface:
+            lanes = PriorityInterface(interface)
+            assert lanes.ping(1) == 1
+            lanes.call_methods([('ping', (1, )), ('ping', (2, ))], 'bulk')
+            stats = lanes.stats()
+
+    assert stats['realtime'].count == 0
+    assert stats['normal'].count == 1
+    assert stats['bulk'].count == 2
+    assert 0 < stats['bulk'].mean <= stats['bulk'].p99 <= (
+        stats['bulk'].maximum)
+
+
+def test_invalid_lane() -> None:
+    with LocalServer(_device([])) as server:
+        with Interface(server.url, wait=0) as interface:
+            try:
+                PriorityInterface(interface).call_method(
+                    'ping', 1, lane='fast')
+            except ValueError as error:
+                assert str(error) == 'invalid lane: fast'
+            else:
+                assert False
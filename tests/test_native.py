@@ -0,0 +1,86 @@
+from threading import Timer
+from time import sleep
+
+from serial import serial_for_url
+from serial.serialutil import SerialException
+
+from simple_rpc.native.protocol_posix import Serial
+from simple_rpc.sim import PtyServer
+from simple_rpc.simple_rpc import CallTimeoutError, Interface
+
+from .conf import _device
+
+
+_methods = (
+    (lambda: [1, 2, 3], '[h]:', 'vector: Get a vector.'),
+    (lambda x: sleep(x) or 1, 'f: f', 'slow: Wait a while.'))
+
+
+def test_from_url() -> None:
+    connection = Serial()
+
+    assert connection.from_url('posix:///dev/ttyACM0') == '/dev/ttyACM0'
+    assert connection.from_url('/dev/ttyACM0') == '/dev/ttyACM0'
+    try:
+        connection.from_url('socket://localhost:1000')
+    except SerialException:
+        pass
+    else:
+        assert False
+
+
+def test_serial_for_url() -> None:
+    with PtyServer(_device(*_methods)) as server:
+        connection = serial_for_url('posix://' + server.url)
+
+        assert isinstance(connection, Serial)
+        assert connection.port == server.url
+        connection.close()
+
+
+def test_read_timeout() -> None:
+    with PtyServer(_device(*_methods)) as server:
+        connection = serial_for_url('posix://' + server.url, timeout=0.05)
+        buffer = bytearray(4)
+
+        assert connection.readinto(buffer) == 0
+        assert connection.read(2) == b''
+        connection.close()
+
+
+def test_interface() -> None:
+    with PtyServer(_device(*_methods)) as server:
+        with Interface('posix://' + server.url, wait=0) as interface:
+            assert interface._receive_buffer is not None
+            assert interface.ping(3) == 3
+            assert interface.vector() == [1, 2, 3]
+            assert interface.call_methods(
+                [('ping', (1, )), ('vector', ())]) == [1, [1, 2, 3]]
+
+
+def test_interface_timeout() -> None:
+    with PtyServer(_device(*_methods)) as server:
+        with Interface(
+                'posix://' + server.url, wait=0, timeout=0.2) as interface:
+            try:
+                interface.slow(0.3)
+            except CallTimeoutError:
+                pass
+            else:
+                assert False
+            sleep(0.2)  # Let the device finish the slow call.
+            assert interface.ping(3) == 3
+
+
+def test_interface_cancel() -> None:
+    with PtyServer(_device(*_methods)) as server:
+        with Interface('posix://' + server.url, wait=0) as interface:
+            Timer(0.1, interface.cancel).start()
+            try:
+                interface.slow(0.3)
+            except CallTimeoutError as error:
+                assert str(error) == 'call cancelled'
+            else:
+                assert False
+            sleep(0.3)  # Let the device finish the cancelled call.
+            assert interface.ping(3) == 3
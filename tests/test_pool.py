@@ -0,0 +1,104 @@
+from simple_rpc.pool import DevicePool
+from simple_rpc.sim import Device, PtyServer
+
+from .conf import _device
+
+
+def _value_device(value: int) -> Device:
+    return _device((lambda: value, 'B:', 'value: Get the device value.'))
+
+
+def test_pool() -> None:
+    servers = [PtyServer(_value_device(i)) for i in range(3)]
+    devices = [server.url for server in servers]
+
+    with DevicePool(devices, 2, wait=0) as pool:
+        assert pool.call_method(devices[1], 'ping', 3) == 3
+        assert pool.call_many([
+            (devices[0], 'value', ()), (devices[2], 'value', ()),
+            (devices[0], 'ping', (4, ))]) == [0, 2, 4]
+        assert pool.broadcast('value') == dict(zip(devices, range(3)))
+
+    for server in servers:
+        server.close()
+
+
+def test_pool_definitions() -> None:
+    servers = [PtyServer(_value_device(i)) for i in range(2)]
+    devices = [server.url for server in servers]
+
+    with DevicePool(devices, wait=0) as pool:
+        definitions = pool.definitions()
+    assert list(definitions[devices[0]]['methods']) == ['ping', 'value']
+
+    with DevicePool(devices, definitions=definitions, wait=0) as pool:
+        assert pool.broadcast('ping', 5) == {devices[0]: 5, devices[1]: 5}
+
+    for server in servers:
+        server.close()
+
+
+def test_pool_error() -> None:
+    server = PtyServer(_value_device(0))
+
+    with DevicePool([server.url], wait=0) as pool:
+        try:
+            pool.call_method(server.url, 'missing')
+        except ValueError as error:
+            assert str(error) == 'invalid method name: missing'
+        else:
+            assert False
+        assert pool.call_method(server.url, 'ping', 1) == 1
+
+        try:
+            pool.call_method('unknown', 'ping', 1)
+        except ValueError as error:
+            assert str(error) == 'unknown device: unknown'
+        else:
+            assert False
+
+    server.close()
+
+
+def test_pool_device_error() -> None:
+    servers = [PtyServer(_value_device(i)) for i in range(2)]
+    devices = [server.url for server in servers]
+
+    with DevicePool(devices, 1, wait=0, timeout=0.1) as pool:
+        servers[1].close()
+        results = pool.broadcast('value', return_exceptions=True)
+        assert results[devices[0]] == 0
+        assert isinstance(results[devices[1]], IOError)
+
+        try:
+            pool.call_many([
+                (devices[1], 'value', ()), (devices[0], 'ping', (2, ))])
+        except IOError:
+            pass
+        else:
+            assert False
+        assert pool.call_method(devices[0], 'ping', 3) == 3
+
+    servers[0].close()
+
+
+def test_pool_no_devices() -> None:
+    try:
+        DevicePool([])
+    except ValueError as error:
+        assert str(error) == 'no devices given'
+    else:
+        assert False
+
+
+def test_pool_open_error() -> None:
+    server = PtyServer(_value_device(0))
+
+    try:
+        DevicePool([server.url, '/dev/non_existing'], 2, wait=0)
+    except IOError as error:
+        assert str(error) == 'could not open device'
+    else:
+        assert False
+
+    server.close()
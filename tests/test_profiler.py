@@ -0,0 +1,59 @@
+from simple_rpc.profiler import Profile, _percentile, profile
+from simple_rpc.sim import LocalServer
+from simple_rpc.simple_rpc import Interface
+
+from .conf import _device
+
+
+_methods = (
+    (lambda: [1, 2, 3], '[h]:', 'vector: Get a vector.'),
+    (lambda x: None, ': s', 'drop: Drop a value.'))
+
+
+def test_percentile() -> None:
+    values = list(range(10))
+
+    assert _percentile(values, 0.5) == 5
+    assert _percentile(values, 0.99) == 9
+    assert _percentile(values, 1.0) == 9
+
+
+def test_profile_properties() -> None:
+    result = Profile(10, 3, 2, 1000, 0.1, 0.2, 0.3, 0.4, 0.01)
+
+    assert result.transfer_time == 0.05
+    assert abs(result.device_time - 0.04) < 1e-9
+    assert abs(result.bytes_per_second - 50) < 1e-9
+    assert abs(result.utilisation - 0.5) < 1e-9
+
+
+def test_profile() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            result = profile(interface, 'ping', (3, ), 10)
+
+    assert result.count == 10
+    assert result.request_size == 2
+    assert result.response_size == 1
+    assert result.baudrate == 9600
+    assert 0 < result.p50 <= result.p90 <= result.p99 <= result.maximum
+    assert result.host_time > 0
+
+
+def test_profile_sizes() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            vector = profile(interface, 'vector', (), 1)
+            drop = profile(interface, 'drop', (b'abc', ), 1)
+
+    assert (vector.request_size, vector.response_size) == (1, 8)
+    assert (drop.request_size, drop.response_size) == (5, 1)
+
+
+def test_profile_count() -> None:
+    try:
+        profile(None, 'ping', (), 0)
+    except ValueError as error:
+        assert str(error) == 'count must be positive'
+    else:
+        assert False
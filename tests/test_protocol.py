@@ -1,6 +1,7 @@
 from simple_rpc.protocol import (
-    _add_doc, _parse_signature, _strip_split, _type_name, _parse_type,
-    parse_line)
+    _add_doc, _parse_signature, _strip_split, _type_name, _type_str,
+    _parse_type, MethodIndex, fingerprint, line_name, make_line, parse_line,
+    type_info)
 
 
 def test_parse_type_none() -> None:
@@ -57,6 +58,46 @@ def test_parse_type_complex() -> None:
         (('c', 'c'), 'c'), 'i', (['c'], ), )
 
 
+def test_parse_type_copy() -> None:
+    obj_type = _parse_type(b'[i]')
+    obj_type.append('c')
+
+    assert _parse_type(b'[i]') == ['i']
+
+
+def test_type_info_basic() -> None:
+    info = type_info(b'H')
+
+    assert info == ('H', 2, 'H', 'int')
+    assert info is type_info(b'H')
+    assert hash(info) == hash(type_info(b'H'))
+
+
+def test_type_info_none() -> None:
+    assert type_info(b'') == ('', 0, '', '')
+
+
+def test_type_info_object() -> None:
+    info = type_info(b'((ic)f)')
+
+    assert info.size == 9
+    assert info.fmt == 'icf'
+    assert info.name == '((int, bytes), float)'
+
+
+def test_type_info_string() -> None:
+    assert type_info(b's')[1:] == (None, None, 'bytes')
+
+
+def test_type_info_vector() -> None:
+    info = type_info(b'([c]i)')
+
+    assert info.size is None
+    assert info.fmt is None
+    assert info.name == '([bytes], int)'
+    assert hash(info.obj_type)
+
+
 def test_type_name_none() -> None:
     assert _type_name(None) == ''
 
@@ -153,3 +194,64 @@ def test_parse_line() -> None:
 
     assert method['index'] == 1
     assert method['name'] == 'name'
+
+
+def test_type_str_none() -> None:
+    assert _type_str('') == ''
+
+
+def test_type_str_complex() -> None:
+    assert _type_str(((('c', 'c'), 'c'), 'i', (['c'], ))) == '(((cc)c)i([c]))'
+
+
+def test_make_line() -> None:
+    line = b'i: c f;name: Test. @p1: Char. @p2: Float. @return: Int.'
+
+    assert make_line(parse_line(1, line)) == line
+
+
+def test_make_line_void() -> None:
+    line = b': [c];name: Test. @p1: Chars.'
+
+    assert make_line(parse_line(1, line)) == line
+
+
+def test_line_name() -> None:
+    assert line_name(1, b'i: c f;name: Test. @p1: Char.') == 'name'
+    assert line_name(1, b'i: c f;@p1: Char. @p2: Float.') == 'method1'
+
+
+def test_method_index() -> None:
+    methods = MethodIndex([
+        b'i: c f;name: Test. @p1: Char. @p2: Float. @return: Int.',
+        b': i;other: Other.'])
+
+    assert list(methods) == ['name', 'other']
+    assert 'other' in methods
+    assert methods['other']['index'] == 1
+    assert methods['name']['parameters'][0]['name'] == 'p1'
+
+
+def test_method_index_lazy() -> None:
+    methods = MethodIndex([b'i: c f;name: Test.', b'i i;other: Other.'])
+
+    assert methods['name']['index'] == 0
+    try:
+        methods['other']
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def test_fingerprint() -> None:
+    assert fingerprint('<', 'H', [b'h: h B;inc: Increment.']) == fingerprint(
+        '<', 'H', [b'h:h  B;inc: Other documentation. @a: Value.'])
+
+
+def test_fingerprint_changed() -> None:
+    checksum = fingerprint('<', 'H', [b'h: h;inc: Increment.'])
+
+    assert fingerprint('>', 'H', [b'h: h;inc: Increment.']) != checksum
+    assert fingerprint('<', 'H', [b'h: H;inc: Increment.']) != checksum
+    assert fingerprint('<', 'H', [b'h: h;dec: Increment.']) != checksum
@@ -0,0 +1,107 @@
+from contextlib import ExitStack
+from threading import Thread
+from time import perf_counter, sleep
+
+from simple_rpc.router import Router
+from simple_rpc.sim import Device, LocalServer
+from simple_rpc.simple_rpc import Interface
+
+
+def _device(state: dict, delay: float=0) -> Device:
+    device = Device()
+    device.add_method(
+        lambda x: sleep(delay) or x, 'B: B', 'ping: Echo a value.')
+
+    def _read() -> int:
+        if state['slow']:
+            state['slow'] -= 1
+            sleep(0.5)
+        return 42
+
+    device.add_method(_read, 'h:', 'read: Read a sensor.')
+
+    return device
+
+
+def _interfaces(stack: ExitStack, devices: list) -> list:
+    return [
+        stack.enter_context(Interface(
+            stack.enter_context(LocalServer(device)).url, wait=0))
+        for device in devices]
+
+
+def test_least_loaded() -> None:
+    state = {'slow': 0}
+
+    with ExitStack() as stack:
+        router = Router(_interfaces(
+            stack, [_device(state, 0.01), _device(state, 0.01)]))
+        threads = [
+            Thread(target=lambda: [router.ping(i) for i in range(10)])
+            for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    counts = [stats.count for stats in router.stats()]
+    assert sum(counts) == 40
+    assert min(counts) >= 10
+
+
+def test_lowest_latency() -> None:
+    state = {'slow': 0}
+
+    with ExitStack() as stack:
+        router = Router(_interfaces(
+            stack, [_device(state, 0.05), _device(state)]))
+        for i in range(10):
+            assert router.call_method('ping', i) == i
+        assert router.call_methods([('ping', (1, )), ('read', ())]) == [1, 42]
+
+    stats = router.stats()
+    assert stats[0].count == 1
+    assert stats[1].count == 10
+    assert stats[0].latency > stats[1].latency
+
+
+def test_hedge() -> None:
+    state = {'slow': 0}
+
+    with ExitStack() as stack:
+        with Router(_interfaces(
+                stack, [_device(state), _device(state)]),
+                hedge=['read']) as router:
+            for _ in range(20):
+                assert router.read() == 42
+            assert router.hedged == 0
+
+            state['slow'] = 1
+            start = perf_counter()
+            assert router.read() == 42
+            assert perf_counter() - start < 0.4
+            assert router.hedged == 1
+
+
+def test_different_definitions() -> None:
+    other = Device()
+    other.add_method(lambda x: x, 'h: h', 'ping: Echo a value.')
+
+    with ExitStack() as stack:
+        try:
+            Router(_interfaces(stack, [_device({'slow': 0}), other]))
+        except ValueError as error:
+            assert str(error) == 'interfaces have different definitions'
+        else:
+            assert False
+
+
+def test_invalid_hedge() -> None:
+    with ExitStack() as stack:
+        try:
+            Router(
+                _interfaces(stack, [_device({'slow': 0})]), hedge=['write'])
+        except ValueError as error:
+            assert str(error) == 'invalid method name: write'
+        else:
+            assert False
@@ -0,0 +1,35 @@
+from os import close, openpty, ttyname
+from time import perf_counter
+from tty import setraw
+
+from simple_rpc.scan import ports, scan
+from simple_rpc.sim import LocalServer
+
+from .conf import _device
+
+
+def test_ports() -> None:
+    assert ports(()) == []
+
+
+def test_scan() -> None:
+    master, slave = openpty()
+    setraw(slave)
+
+    with LocalServer(_device()) as first, LocalServer(_device()) as second:
+        start = perf_counter()
+        definitions = scan(
+            [first.url, 'sim://missing', ttyname(slave), second.url],
+            wait=0.2, timeout=0.2)
+        assert perf_counter() - start < 0.8
+
+    close(slave)
+    close(master)
+
+    assert list(definitions) == [first.url, second.url]
+    assert definitions[first.url]['size_t'] == 'H'
+    assert list(definitions[first.url]['methods']) == ['ping']
+
+
+def test_scan_empty() -> None:
+    assert scan([]) == {}
@@ -0,0 +1,60 @@
+from simple_rpc import Interface
+from simple_rpc.scheduler import Scheduler
+from simple_rpc.sim import LocalServer
+
+from .conf import _device
+
+
+_methods = (
+    (lambda: 1, 'B:', 'one: One.'), )
+
+
+def test_scheduler() -> None:
+    samples = []
+
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            scheduler = Scheduler()
+            scheduler.add(interface, 'ping', (3, ), 0.01)
+            scheduler.add(interface, 'one', (), 0.02)
+            scheduler.run(samples.append, 6)
+
+    assert len(samples) == 6
+    assert [sample.job.name for sample in samples[:3]] == [
+        'ping', 'one', 'ping']
+    assert samples[0].result == 3
+    assert samples[1].result == 1
+    assert samples[-1].time - samples[0].time < 0.1
+    assert scheduler.missed == 0
+
+
+def test_scheduler_missed() -> None:
+    samples = []
+
+    with LocalServer(_device(*_methods), latency=0.03) as server:
+        with Interface(server.url, wait=0) as interface:
+            scheduler = Scheduler()
+            scheduler.add(interface, 'ping', (3, ), 0.01)
+            scheduler.run(samples.append, 3)
+
+    assert samples[1].missed >= 1
+    assert scheduler.missed == sum(map(lambda x: x.missed, samples))
+
+
+def test_scheduler_stop() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            scheduler = Scheduler()
+            scheduler.add(interface, 'one', period=0.01)
+            scheduler.run(lambda x: scheduler.stop())
+
+    assert scheduler.missed == 0
+
+
+def test_scheduler_period() -> None:
+    try:
+        Scheduler().add(None, 'ping', (), 0)
+    except ValueError as error:
+        assert str(error) == 'period must be positive'
+    else:
+        assert False
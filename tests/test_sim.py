@@ -0,0 +1,105 @@
+from io import BytesIO
+
+from simple_rpc import Interface
+from simple_rpc.sim import Device, LocalServer, PtyServer, TcpServer
+from simple_rpc.simple_rpc import _version
+
+
+def _device() -> Device:
+    device = Device()
+
+    @device.method(
+        'B: B', 'ping: Echo a value. @data: Value. @return: Value of data.')
+    def ping(data: int) -> int:
+        return data
+
+    @device.method('s: s [H]')
+    def join(s: bytes, v: list) -> bytes:
+        """Join a string and a vector."""
+        return s + b' ' + b' '.join(map(lambda x: str(x).encode(), v))
+
+    @device.method(': B', 'set: Set a value. @value: Value.')
+    def set_(value: int) -> None:
+        device.value = value
+
+    return device
+
+
+class _TestServer(object):
+    def test_call(self: object) -> None:
+        with self._server(_device()) as server:
+            with Interface(server.url, wait=0) as interface:
+                assert interface.ping(3) == 3
+                assert interface.join(b'a', [1, 2]) == b'a 1 2'
+
+    def test_void(self: object) -> None:
+        device = _device()
+
+        with self._server(device) as server:
+            with Interface(server.url, wait=0) as interface:
+                assert interface.set(10) is None
+                assert device.value == 10
+
+    def test_doc(self: object) -> None:
+        with self._server(_device()) as server:
+            with Interface(server.url, wait=0) as interface:
+                methods = interface.device['methods']
+                assert methods['ping']['doc'] == 'Echo a value.'
+                assert methods['ping']['parameters'][0]['name'] == 'data'
+                assert methods['join']['doc'] == 'Join a string and a vector.'
+                assert interface.device['version'] == _version
+
+
+class TestLocalServer(_TestServer):
+    _server = LocalServer
+
+
+class TestPtyServer(_TestServer):
+    _server = PtyServer
+
+
+def test_listing() -> None:
+    listing = _device().listing()
+
+    assert listing.startswith(b'simpleRPC\0' + bytes(_version) + b'<H\0')
+    assert b'\0B: B;ping: Echo a value. @data: Value. ' in listing
+    assert listing.endswith(b'\0\0')
+
+
+def test_handle() -> None:
+    stream = BytesIO(b'\0\x05')
+    stream.flush = lambda: None
+    device = _device()
+
+    assert device.handle(stream)
+    assert stream.getvalue()[2:] == b'\x05'
+    assert not device.handle(stream)
+
+
+def test_from_definition() -> None:
+    with LocalServer(_device()) as server:
+        with Interface(server.url, wait=0) as interface:
+            device = Device.from_definition(interface.device, {
+                'ping': lambda x: x + 1, 'join': None, 'set': None})
+
+    assert device.methods[0]['name'] == 'ping'
+    assert device.methods[0]['doc'] == 'Echo a value.'
+    assert device.listing() == _device().listing()
+
+
+def test_tcp_server() -> None:
+    with TcpServer(_device()) as server:
+        assert server.url.startswith('socket://localhost:')
+        with Interface(server.url, wait=0) as interface:
+            assert interface.ping(3) == 3
+
+
+def test_local_server_name() -> None:
+    with LocalServer(_device(), name='test') as server:
+        assert server.url == 'sim://test'
+        try:
+            LocalServer(_device(), name='test')
+        except ValueError as error:
+            assert str(error) == 'device name in use: test'
+        else:
+            assert False
@@ -1,8 +1,21 @@
+from io import StringIO
+from os import close, openpty, ttyname
+from termios import HUPCL, TCSANOW, tcgetattr, tcsetattr
+from threading import Thread, Timer
+from time import perf_counter, sleep
+from tty import setraw
+
+from yaml import FullLoader, load
+
+from simple_rpc.coalesce import WriteBehind
+from simple_rpc.protocol import MethodIndex
+from simple_rpc.sim import Device, LocalServer, PtyServer
 from simple_rpc.simple_rpc import (
+    CallTimeoutError,
     SerialInterface, SocketInterface, Interface,
-    _assert_protocol, _assert_version, _protocol, _version)
+    _Deadline, _assert_protocol, _assert_version, _protocol, _version)
 
-from .conf import _devices
+from .conf import _device, _devices
 
 
 def test_assert_protocol_pass() -> None:
@@ -39,3 +52,529 @@ def test_SerialInterface() -> None:
 def test_SocketInterface() -> None:
     interface = Interface(_devices['wifi'], autoconnect=False)
     assert isinstance(interface, SocketInterface)
+
+
+_methods = (
+    (lambda x: x + 1, 'h: h', 'inc: Increment a value.'),
+    (lambda x, y: (x[1], y), '(fs): (Bf) s', 'swap: Swap values.'),
+    (lambda x: sleep(x) or b'done', 's: f', 'slow: Wait a while.'))
+
+
+def test_lazy() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0, lazy=True) as interface:
+            methods = interface.device['methods']
+            assert isinstance(methods, MethodIndex)
+            assert list(methods) == ['ping', 'inc', 'swap', 'slow']
+            assert 'inc' not in vars(interface)
+            assert interface.inc(1) == 2
+            assert 'inc' in vars(interface)
+            assert 'ping' not in vars(interface)
+            assert interface.call_method('ping', 3) == 3
+
+        assert interface.device['methods'] == {}
+        assert 'inc' not in vars(interface)
+
+
+def test_lazy_save() -> None:
+    handle = StringIO()
+
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0, lazy=True) as interface:
+            interface.save(handle)
+
+    handle.seek(0)
+    device = load(handle, Loader=FullLoader)
+    assert device['methods']['ping']['doc'] == 'Echo a value.'
+
+
+def test_no_attribute() -> None:
+    interface = Interface(_devices['serial'], autoconnect=False)
+
+    try:
+        interface.inc
+    except AttributeError:
+        pass
+    else:
+        assert False
+
+
+def test_fixed_size() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            assert interface._codecs['ping']
+            assert interface.ping(3) == 3
+            assert interface.ping(3.0) == 3
+            assert interface.inc(-2) == -1
+
+
+def test_variable_size() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            assert interface._codecs['swap'] is None
+            assert interface.swap((1, 2.5), b'a') == (2.5, b'a')
+
+
+def test_call_methods() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            writes = []
+            write = interface._connection.write
+            interface._connection.write = (
+                lambda x: writes.append(x) or write(x))
+
+            assert interface.call_methods([
+                ('ping', (3, )), ('swap', ((1, 2.5), b'a')),
+                ('inc', (1, ))]) == [3, (2.5, b'a'), 2]
+            assert len(writes) == 1
+
+
+def test_timeout() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0, timeout=0.2) as interface:
+            start = perf_counter()
+            try:
+                interface.slow(0.5)
+            except CallTimeoutError as error:
+                assert str(error).startswith('no response from device')
+            else:
+                assert False
+            assert perf_counter() - start < 0.35
+            sleep(0.4)  # Let the device finish the slow call.
+            assert interface.ping(3) == 3
+            assert interface.slow(0.01) == b'done'
+
+
+def test_timeout_call() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            try:
+                interface.call_method('slow', 0.3, timeout=0.1)
+            except CallTimeoutError:
+                pass
+            else:
+                assert False
+            assert interface._connection.timeout is None
+            sleep(0.3)  # Let the device finish the slow call.
+            assert interface.call_methods(
+                [('ping', (3, )), ('inc', (1, ))]) == [3, 2]
+
+
+class _Connection(object):
+    timeout = None
+
+    def read(self: object, size: int=1) -> bytes:
+        return bytes(size)
+
+
+def test_deadline() -> None:
+    connection = _Connection()
+
+    deadline = _Deadline(connection, 10)
+    assert deadline.read(2) == b'\0\0'
+    assert 9 < connection.timeout <= 10
+    deadline.timeout = 0.5
+    deadline.read()
+    assert connection.timeout == 0.5
+
+    _Deadline(connection, 0).read()
+    assert connection.timeout == 0
+
+
+def test_timeout_lost_request() -> None:
+    lost = [0]
+    device = _device(*_methods)
+    device.add_method(
+        lambda x: lost.__setitem__(0, x), ': B', 'lose: Ignore some bytes.')
+    handle = device.handle
+
+    def _handle(stream: object) -> bool:
+        if not lost[0]:
+            return handle(stream)
+        lost[0] -= 1
+        return bool(stream.read(1))
+
+    device.handle = _handle
+    with LocalServer(device) as server:
+        with Interface(server.url, wait=0) as interface:
+            interface.lose(3)  # A ping request and a method list request.
+            try:
+                interface.call_method('ping', 3, timeout=0.1)
+            except CallTimeoutError:
+                pass
+            else:
+                assert False
+            assert interface._desynchronised
+            assert interface.ping(4) == 4
+
+
+def test_cancel() -> None:
+    with PtyServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            Timer(0.1, interface.cancel).start()
+            try:
+                interface.slow(0.3)
+            except CallTimeoutError as error:
+                assert str(error) == 'call cancelled'
+            else:
+                assert False
+            sleep(0.3)  # Let the device finish the cancelled call.
+            assert interface.ping(3) == 3
+
+
+def test_cancel_unsupported() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            try:
+                interface.cancel()
+            except NotImplementedError:
+                pass
+            else:
+                assert False
+
+
+def _record_writes(interface: object) -> list:
+    sizes = []
+    write = interface._connection.write
+
+    def _write(data: bytes) -> int:
+        sizes.append(len(data))
+        return write(data)
+
+    interface._connection.write = _write
+
+    return sizes
+
+
+def test_window() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0, window=4) as interface:
+            sizes = _record_writes(interface)
+            assert interface.call_methods(
+                [('ping', (i, )) for i in range(4)]) == [0, 1, 2, 3]
+
+    assert sizes == [4, 2, 2]
+
+
+def test_window_large_request() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0, window=1) as interface:
+            sizes = _record_writes(interface)
+            assert interface.call_methods(
+                [('ping', (1, )), ('ping', (2, ))]) == [1, 2]
+
+    assert sizes == [2, 2]
+
+
+def test_window_unlimited() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            sizes = _record_writes(interface)
+            interface.call_methods([('ping', (i, )) for i in range(4)])
+
+    assert sizes == [8]
+
+
+def test_load_definition() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            definition = dict(
+                interface.device, methods=dict(interface.device['methods']))
+
+        with Interface(server.url, wait=0, load=definition) as interface:
+            assert interface.ping(3) == 3
+    assert list(definition['methods']) == ['ping', 'inc', 'swap', 'slow']
+
+
+def _void_device() -> Device:
+    device = Device()
+    state = {}
+    device.add_method(
+        lambda x, y: state.update({x: y}), ': B B', 'set: Set a value.')
+    device.add_method(lambda x: state.get(x, 0), 'B: B', 'get: Get a value.')
+
+    return device
+
+
+def test_nowait() -> None:
+    with LocalServer(_void_device()) as server:
+        with Interface(server.url, wait=0, nowait=True) as interface:
+            reads = []
+            read = interface._connection.read
+            interface._connection.read = lambda x: reads.append(x) or read(x)
+
+            for i in range(10):
+                assert interface.set(1, i) is None
+            assert interface._pending_acks == 10
+            assert not reads
+
+            assert interface.get(1) == 9
+            assert interface._pending_acks == 0
+            assert reads[0] == 10
+
+
+def test_nowait_sync() -> None:
+    with LocalServer(_void_device()) as server:
+        with Interface(server.url, wait=0, nowait=True) as interface:
+            interface.set(1, 2)
+            interface.sync()
+            assert interface._pending_acks == 0
+            interface.sync()
+
+
+def test_nowait_window() -> None:
+    with LocalServer(_void_device()) as server:
+        with Interface(
+                server.url, wait=0, nowait=True, window=6) as interface:
+            for i in range(10):
+                interface.set(i, i)
+                assert interface._pending_size <= 6
+            assert interface.call_methods(
+                [('get', (i, )) for i in range(10)]) == list(range(10))
+
+
+def test_nowait_invalid_ack() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            definition = dict(
+                interface.device, methods=dict(interface.device['methods']))
+        ping = definition['methods']['ping']
+        definition['methods']['ping'] = dict(
+            ping, **{'return': dict(ping['return'], fmt='')})
+
+        with Interface(
+                server.url, wait=0, load=definition, nowait=True
+                ) as interface:
+            interface.ping(3)
+            try:
+                interface.sync()
+            except ValueError as error:
+                assert str(error) == 'invalid acknowledgement'
+            else:
+                assert False
+            assert interface.inc(1) == 2
+
+
+def _unplug(
+        server: LocalServer, delay: float=None, device: Device=None) -> list:
+    """Disconnect a simulated device and bring it back after a while.
+
+    :returns: List that receives the new server.
+    """
+    servers = []
+    server.close()
+    if delay is not None:
+        Timer(delay, lambda: servers.append(LocalServer(
+            device or _device(*_methods), name=server.url[6:]))).start()
+
+    return servers
+
+
+def test_reconnect() -> None:
+    server = LocalServer(_device(*_methods))
+    with Interface(server.url, wait=0, reconnect=2) as interface:
+        assert interface.ping(1) == 1
+        servers = _unplug(server, 0.2)
+        assert interface.ping(2) == 2
+        assert interface.call_methods([('inc', (3, )), ('ping', (4, ))]) == [
+            4, 4]
+    servers[0].close()
+
+
+def test_reconnect_disabled() -> None:
+    server = LocalServer(_device(*_methods))
+    with Interface(server.url, wait=0) as interface:
+        _unplug(server)
+        try:
+            interface.ping(1)
+        except IOError as error:
+            assert not isinstance(error, TimeoutError)
+        else:
+            assert False
+
+
+def test_reconnect_timeout() -> None:
+    server = LocalServer(_device(*_methods))
+    with Interface(server.url, wait=0, reconnect=0.2) as interface:
+        _unplug(server)
+        try:
+            interface.ping(1)
+        except IOError as error:
+            assert str(error) == 'device disconnected'
+        else:
+            assert False
+
+
+def _crash_device(calls: list) -> Device:
+    def _crash() -> int:
+        calls.append(None)
+        if len(calls) == 1:
+            raise OSError('power failure')
+        return 1
+
+    return _device((_crash, 'B:', 'crash: Lose the connection once.'))
+
+
+def test_reconnect_sent() -> None:
+    calls = []
+    with LocalServer(_crash_device(calls)) as server:
+        with Interface(server.url, wait=0, reconnect=2) as interface:
+            try:
+                interface.crash()
+            except IOError as error:
+                assert str(error) == (
+                    'device disconnected after the request was sent')
+            else:
+                assert False
+            assert interface.ping(3) == 3
+    assert len(calls) == 1
+
+
+def test_reconnect_retry() -> None:
+    calls = []
+    with LocalServer(_crash_device(calls)) as server:
+        with Interface(
+                server.url, wait=0, reconnect=2, retry=True) as interface:
+            assert interface.crash() == 1
+    assert len(calls) == 2
+
+
+def test_reconnect_changed() -> None:
+    device = Device()
+    device.add_method(lambda x: x, 'h: h', 'ping: Echo a value.')
+
+    server = LocalServer(_device(*_methods))
+    with Interface(server.url, wait=0, reconnect=2) as interface:
+        servers = _unplug(server, 0, device)
+        try:
+            interface.ping(1)
+        except ValueError as error:
+            assert str(error) == 'device interface changed'
+        else:
+            assert False
+    servers[0].close()
+
+
+def test_no_reset() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        start = perf_counter()
+        with Interface(server.url, wait=5, reset=False) as interface:
+            assert perf_counter() - start < 1
+            assert interface.ping(3) == 3
+
+
+def test_no_reset_hupcl() -> None:
+    with PtyServer(_device(*_methods)) as server:
+        with Interface(server.url, wait=0) as interface:
+            attributes = tcgetattr(interface._connection.fd)
+            attributes[2] |= HUPCL
+            tcsetattr(interface._connection.fd, TCSANOW, attributes)
+        with Interface(server.url, wait=0) as interface:
+            assert tcgetattr(interface._connection.fd)[2] & HUPCL
+        with Interface(server.url, wait=0, reset=False) as interface:
+            assert not tcgetattr(interface._connection.fd)[2] & HUPCL
+
+
+def test_no_reset_no_response() -> None:
+    master, slave = openpty()
+    setraw(slave)
+
+    interface = Interface(
+        ttyname(slave), wait=0.3, autoconnect=False, reset=False)
+    interface._open()
+    start = perf_counter()
+    assert interface._start() is None
+    assert perf_counter() - start >= 0.3
+    interface.close()
+
+    close(slave)
+    close(master)
+
+
+def test_shared() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        interface = Interface.shared(server.url, wait=0)
+        other = Interface.shared(server.url, wait=0)
+        assert interface is other
+        assert interface.users == 2
+
+        results = []
+        threads = [Thread(target=lambda: results.append(
+            [interface.ping(i) for i in range(50)])) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [list(range(50))] * 4
+
+        interface.release()
+        assert interface.is_open()
+        with other:
+            pass
+        assert not interface.interface.is_open()
+
+
+def test_shared_idle_timeout() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        interface = Interface.shared(server.url, 0.1, wait=0)
+        interface.release()
+        assert Interface.shared(server.url) is interface
+        interface.release()
+        assert interface.interface.is_open()
+        sleep(0.2)
+        assert not interface.interface.is_open()
+
+        other = Interface.shared(server.url, wait=0)
+        assert other is not interface
+        other.release()
+
+
+def test_shared_definition() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        with Interface.shared(server.url, wait=0) as interface:
+            assert interface.url == server.url
+            assert interface.device is interface.interface.device
+            with WriteBehind(interface, 0) as writer:
+                assert writer.ping(3) == 3
+
+
+def test_shared_concurrent() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        interfaces = []
+        threads = [Thread(target=lambda: interfaces.append(
+            Interface.shared(server.url, wait=0))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(map(id, interfaces))) == 1
+        assert interfaces[0].users == 4
+        assert interfaces[0].ping(3) == 3
+        for interface in interfaces:
+            interface.release()
+        assert not interfaces[0].interface.is_open()
+
+
+def test_shared_connection_failed() -> None:
+    try:
+        Interface.shared('sim://missing', wait=0)
+    except IOError:
+        pass
+    else:
+        assert False
+    with LocalServer(_device(*_methods), name='missing') as server:
+        with Interface.shared(server.url, wait=0) as interface:
+            assert interface.ping(3) == 3
+
+
+def test_shared_release() -> None:
+    with LocalServer(_device(*_methods)) as server:
+        interface = Interface.shared(server.url, wait=0)
+        interface.release()
+        try:
+            interface.release()
+        except ValueError as error:
+            assert str(error) == 'interface not in use'
+        else:
+            assert False
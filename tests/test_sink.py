@@ -0,0 +1,92 @@
+from simple_rpc.protocol import parse_line
+from simple_rpc.sink import Reader, Sink
+
+
+def test_sink_scalar(tmp_path: object) -> None:
+    with Sink(str(tmp_path), 'h', 4) as sink:
+        sink.append(-1, 1.0)
+        sink.append(2, 2.0)
+
+    with Reader(str(tmp_path)) as reader:
+        assert reader.columns == ['time', 'value']
+        assert reader.count == 2
+        assert reader.last('time').tolist() == [1.0, 2.0]
+        assert reader.last('value').tolist() == [-1, 2]
+
+
+def test_sink_long(tmp_path: object) -> None:
+    with Sink(str(tmp_path), 'L', 4) as sink:
+        sink.append(123456)
+        sink.append(7)
+
+    with Reader(str(tmp_path)) as reader:
+        assert reader.last('value').tolist() == [123456, 7]
+
+
+def test_sink_object(tmp_path: object) -> None:
+    with Sink(str(tmp_path), ('c', ('f', '?')), 4) as sink:
+        sink.append((b'a', (0.5, True)))
+
+    with Reader(str(tmp_path)) as reader:
+        assert reader.columns == ['time', 'value.0', 'value.1.0', 'value.1.1']
+        assert reader.last('value.0').tolist() == [b'a']
+        assert reader.last('value.1.0').tolist() == [0.5]
+        assert reader.last('value.1.1').tolist() == [True]
+
+
+def test_sink_ring(tmp_path: object) -> None:
+    with Sink(str(tmp_path), 'B', 3) as sink:
+        for value in range(5):
+            sink.append(value)
+
+    with Reader(str(tmp_path)) as reader:
+        assert reader.count == 5
+        assert reader.last('value').tolist() == [2, 3, 4]
+        assert reader.last('value', 2).tolist() == [3, 4]
+
+
+def test_sink_live(tmp_path: object) -> None:
+    with Sink(str(tmp_path), 'B', 3) as sink:
+        with Reader(str(tmp_path)) as reader:
+            sink.append(1)
+            assert reader.last('value').tolist() == [1]
+            sink.append(2)
+            assert reader.last('value').tolist() == [1, 2]
+
+
+def test_sink_reopen(tmp_path: object) -> None:
+    with Sink(str(tmp_path), 'B', 3) as sink:
+        sink.append(1)
+    with Sink(str(tmp_path)) as sink:
+        sink.append(2)
+
+    with Reader(str(tmp_path)) as reader:
+        assert reader.last('value').tolist() == [1, 2]
+
+
+def test_sink_for_method(tmp_path: object) -> None:
+    with Sink.for_method(
+            str(tmp_path), parse_line(0, b'(HH):;f: F.')) as sink:
+        assert sink.columns == ['time', 'value.0', 'value.1']
+
+
+def test_sink_variable_size(tmp_path: object) -> None:
+    try:
+        Sink(str(tmp_path), ['B'])
+    except ValueError as error:
+        assert str(error) == 'only fixed size types can be stored'
+    else:
+        assert False
+
+
+def test_reader_rows(tmp_path: object) -> None:
+    with Sink(str(tmp_path), 'B', 3) as sink:
+        sink.append(1)
+
+    with Reader(str(tmp_path)) as reader:
+        try:
+            reader.last('value', 2)
+        except ValueError as error:
+            assert str(error) == 'only 1 rows are available'
+        else:
+            assert False